@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import signal
+from contextlib import AsyncExitStack
 
 from rich.console import Console
 
 from . import MemoryCore, load_settings
+from .clients import build_http_client
 
 console = Console()
 
@@ -18,7 +20,6 @@ async def _serve_forever(stop_event: asyncio.Event) -> None:
 
 async def main() -> None:
     settings = load_settings()
-    memory_core = MemoryCore(settings)
 
     stop_event = asyncio.Event()
 
@@ -29,15 +30,21 @@ async def main() -> None:
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, _handle_stop)
 
-    await memory_core.startup()
-    console.log("Memory core initialised")
-
-    try:
+    # Callbacks unwind in reverse: the core shuts down before its pooled transport closes.
+    async with AsyncExitStack() as stack:
+        stack.callback(console.log, "Memory core shut down")
+        http_client = await stack.enter_async_context(build_http_client())
+        memory_core = MemoryCore(settings, http_client=http_client)
+        await memory_core.startup()
+        stack.push_async_callback(memory_core.shutdown)
+        console.log("Memory core initialised")
         await _serve_forever(stop_event)
-    finally:
-        await memory_core.shutdown()
-        console.log("Memory core shut down")
 
 
 if __name__ == "__main__":  # pragma: no cover - manual entrypoint
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
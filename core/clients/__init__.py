@@ -1,6 +1,7 @@
 """External service clients used by the memory core."""
 
+from .http import build_http_client
 from .openrouter import OpenRouterClient
 from .tei import TEIClient
 
-__all__ = ["OpenRouterClient", "TEIClient"]
+__all__ = ["OpenRouterClient", "TEIClient", "build_http_client"]
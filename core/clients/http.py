@@ -0,0 +1,68 @@
+"""Shared HTTP transport for outbound service clients."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Collection, Optional
+
+import httpx
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=100,
+    max_connections=200,
+    keepalive_expiry=60.0,
+)
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP/2 client shared by the TEI and OpenRouter clients."""
+
+    try:
+        return httpx.AsyncClient(http2=True, limits=DEFAULT_LIMITS, timeout=DEFAULT_TIMEOUT)
+    except ImportError:  # pragma: no cover - h2 not installed, fall back to HTTP/1.1
+        return httpx.AsyncClient(limits=DEFAULT_LIMITS, timeout=DEFAULT_TIMEOUT)
+
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429})
+
+
+def _is_retryable(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+async def post_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    attempts: int = 3,
+    delay: float = 0.5,
+    multiplier: float = 2.0,
+    max_delay: float = 4.0,
+    passthrough_statuses: Collection[int] = (),
+    **kwargs: Any,
+) -> Optional[httpx.Response]:
+    """POST with bounded backoff; return ``None`` once retries are exhausted.
+
+    Transport errors, 5xx, 408 and 429 are retried. Other 4xx responses are returned
+    to the fallback path immediately since repeating them cannot succeed. Responses
+    whose status is in ``passthrough_statuses`` are handed back as-is so the caller
+    can inspect them.
+    """
+
+    for attempt in range(attempts):
+        try:
+            response = await client.post(url, **kwargs)
+            if response.status_code in passthrough_statuses:
+                return response
+            response.raise_for_status()
+            return response
+        except httpx.HTTPError as exc:
+            if attempt == attempts - 1 or not _is_retryable(exc):
+                return None
+        await asyncio.sleep(min(delay, max_delay))
+        delay *= multiplier
+    return None
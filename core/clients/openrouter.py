@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-import json
-from typing import Iterable, List, Optional
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import httpx
-from tenacity import AsyncRetrying, RetryError, stop_after_attempt, wait_exponential
+import orjson
+from cachetools import TTLCache
+
+from .http import build_http_client, post_with_retry
 
 
 PROMPT_TEMPLATE = """
@@ -44,91 +50,389 @@ Example Output:
 Return JSON only—no prose, comments, or additional text.
 """
 
+# Substituted once at import so the system prefix is byte-identical across calls,
+# which is what provider-side prompt caching keys on.
+PROMPT_TOOLBOX_SNAPSHOT = "memscend-2025-09-19"
+JSON_MODE_INSTRUCTIONS = (
+    "When the response is constrained to a JSON object, wrap the array as "
+    '{"memories": [...]}; for grouped block input use {"blocks": [[...], ...]}.'
+)
+SYSTEM_PROMPT = (
+    PROMPT_TEMPLATE.replace("{{TOOLBOX}}", PROMPT_TOOLBOX_SNAPSHOT)
+    + "\n"
+    + JSON_MODE_INSTRUCTIONS
+    + "\n"
+)
+JSON_OBJECT_FORMAT: Dict[str, str] = {"type": "json_object"}
+# Statuses a provider answers with when a model does not accept ``response_format``.
+_JSON_MODE_REJECTION_STATUSES = frozenset({400, 422})
+STATIC_HEADERS: Dict[str, str] = {
+    "Content-Type": "application/json",
+    "HTTP-Referer": "https://github.com/nalyk/memscend",
+    "X-Title": "Memscend Memory Service",
+}
+SYSTEM_MESSAGE: Dict[str, Any] = {
+    "role": "system",
+    "content": [
+        {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+    ],
+}
+
+# Pre-encoded once; orjson splices the fragment verbatim instead of re-encoding the prompt.
+SYSTEM_MESSAGE_JSON = orjson.Fragment(orjson.dumps(SYSTEM_MESSAGE))
+
+_BULLET_PREFIX = re.compile(r"^\s*[-*\u2022]\s*")
+
+BATCH_INSTRUCTIONS = (
+    "The snippets below are grouped into independent blocks. Apply the rules to each block "
+    "separately and respond with a JSON array containing exactly one JSON array per block, "
+    "in block order."
+)
+
+
+class LLMCache:
+    """Bounded TTL cache for normalisation results keyed by request digest."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 1800.0) -> None:
+        self._entries: Optional[TTLCache[str, List[str]]] = (
+            TTLCache(maxsize=maxsize, ttl=ttl_seconds) if maxsize > 0 else None
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(body: dict) -> str:
+        return hashlib.sha256(orjson.dumps(body, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        if self._entries is None:
+            return None
+        cached = self._entries.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(cached)
+
+    def set(self, key: str, value: List[str]) -> None:
+        if self._entries is not None:
+            self._entries[key] = list(value)
+
+    def clear(self) -> None:
+        if self._entries is not None:
+            self._entries.clear()
+
+
+def _bullet_list(snippets: Sequence[str]) -> str:
+    """Render snippets as a markdown bullet list with a single C-level join."""
+
+    return "- " + "\n- ".join(snippets) if snippets else ""
+
+
+@dataclass
+class _PendingRequest:
+    """Caller waiting on a (possibly coalesced) normalisation round trip."""
+
+    texts: List[str]
+    model: str
+    tenant: Tuple[Optional[str], Optional[str]]
+    future: "asyncio.Future[Optional[List[str]]]" = field(repr=False)
+
+
+class _JSONModeRejectedError(Exception):
+    """The JSON-mode probe was refused; the request is repeated without the field."""
+
 
 class OpenRouterClient:
     """Lightweight async wrapper around OpenRouter's chat completion endpoint."""
 
-    def __init__(self, api_key: str, base_url: str, model: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        *,
+        cache_size: int = 1024,
+        cache_ttl_seconds: float = 1800.0,
+        batch_window_seconds: float = 0.0,
+        max_batch: int = 32,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
         self._model = model
-        self._client = httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0))
+        self._timeout = httpx.Timeout(15.0, connect=5.0)
+        self._headers = {"Authorization": f"Bearer {api_key}", **STATIC_HEADERS}
+        self._owns_client = http_client is None
+        self._client = http_client or build_http_client()
+        self._cache = LLMCache(maxsize=cache_size, ttl_seconds=cache_ttl_seconds)
+        self._batch_window = batch_window_seconds
+        self._max_batch = max(max_batch, 1)
+        self._queue: Optional[asyncio.Queue[_PendingRequest]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._dispatches: Set[asyncio.Task[None]] = set()
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+        # None until the first completion tells us whether the model accepts response_format.
+        self._supports_json_mode: Optional[bool] = None
+
+    @property
+    def cache(self) -> LLMCache:
+        return self._cache
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._worker = None
+            self._queue = None
+        if self._owns_client:
+            await self._client.aclose()
 
-    async def normalize_memories(self, texts: Iterable[str], *, model: Optional[str] = None) -> List[str]:
-        """Use OpenRouter to normalise raw snippets into canonical memory sentences."""
+    async def normalize_memories(
+        self,
+        texts: Iterable[str],
+        *,
+        model: Optional[str] = None,
+        org_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+    ) -> List[str]:
+        """Use OpenRouter to normalise raw snippets into canonical memory sentences.
 
-        payload = list(texts)
+        ``org_id``/``agent_id`` scope micro-batching: only snippets of the same tenant
+        ever share a prompt, so the model cannot move content across tenants.
+        """
+
+        # Repeated snippets add prompt tokens without adding information.
+        payload = list(dict.fromkeys(texts))
         if not payload:
             return []
 
-        body = {
-            "model": model or self._model,
+        model_name = model or self._model
+        cache_key = LLMCache.make_key(self._build_body(payload, model_name))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self._batch_window > 0:
+            normalized = await self._enqueue(payload, model_name, (org_id, agent_id))
+        else:
+            normalized = await self._normalize_single(payload, model_name)
+
+        if normalized is None:
+            return payload
+        self._cache.set(cache_key, normalized)
+        return normalized
+
+    async def ping(self) -> bool:
+        """Check credentials by issuing a tiny completion."""
+
+        # Straight to the wire: a cached reply or the raw-snippet fallback would hide failures.
+        try:
+            content = await self._post_completion(self._build_body(["ping"], self._model))
+        except httpx.HTTPError:
+            return False
+        return content is not None
+
+    # ------------------------------------------------------------------
+    # Request construction and parsing
+
+    @staticmethod
+    def _build_body(payload: Sequence[str], model: str) -> Dict[str, Any]:
+        return {
+            "model": model,
             "messages": [
-                {"role": "system", "content": PROMPT_TEMPLATE},
+                SYSTEM_MESSAGE_JSON,
                 {
                     "role": "user",
-                    "content": "\n".join(f"- {snippet}" for snippet in payload),
+                    "content": _bullet_list(payload),
                 },
             ],
             "max_tokens": 256,
             "temperature": 0.2,
         }
 
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "HTTP-Referer": "https://github.com/nalyk/memscend",
-            "X-Title": "Memscend Memory Service",
+    @staticmethod
+    def _build_batch_body(blocks: Sequence[Sequence[str]], model: str) -> Dict[str, Any]:
+        sections = []
+        for index, block in enumerate(blocks, start=1):
+            sections.append(f"### Block {index}\n{_bullet_list(block)}")
+        return {
+            "model": model,
+            "messages": [
+                SYSTEM_MESSAGE_JSON,
+                {"role": "user", "content": BATCH_INSTRUCTIONS + "\n\n" + "\n\n".join(sections)},
+            ],
+            "max_tokens": min(256 * len(blocks), 4096),
+            "temperature": 0.2,
         }
 
+    @staticmethod
+    def _extract_memories(items: Iterable[Any]) -> List[str]:
+        normalized: List[str] = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if item.get("skip"):
+                continue
+            memory = item.get("memory")
+            if isinstance(memory, str) and memory.strip():
+                normalized.append(memory.strip())
+        return normalized
+
+    async def _complete(self, body: Dict[str, Any]) -> Optional[str]:
+        """POST a chat completion and return the stripped message content."""
+
+        if self._supports_json_mode is False:
+            return await self._post_completion(body)
+
         try:
-            async for attempt in AsyncRetrying(  # type: ignore[no-untyped-call]
-                stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4)
-            ):
-                with attempt:
-                    response = await self._client.post(
-                        f"{self._base_url}/chat/completions",
-                        json=body,
-                        headers=headers,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"].strip()
-
-                    try:
-                        parsed = json.loads(content)
-                    except json.JSONDecodeError:
-                        parsed = None
-
-                    if isinstance(parsed, list):
-                        normalized: List[str] = []
-                        for item in parsed:
-                            if not isinstance(item, dict):
-                                continue
-                            if item.get("skip"):
-                                continue
-                            memory = item.get("memory")
-                            if isinstance(memory, str) and memory.strip():
-                                normalized.append(memory.strip())
-                        if normalized:
-                            return normalized
-
-                    # Fallback to line-based parsing when JSON is unavailable
-                    fallback = [line.strip("- ") for line in content.splitlines() if line.strip()]
-                    if fallback:
-                        return fallback
-        except (httpx.HTTPError, RetryError):
+            content = await self._post_completion(
+                {**body, "response_format": JSON_OBJECT_FORMAT},
+                probe_json_mode=self._supports_json_mode is None,
+            )
+        except _JSONModeRejectedError:
+            # One-time probe: models that reject response_format still work without it.
+            self._supports_json_mode = False
+            return await self._post_completion(body)
+        if content is not None:
+            self._supports_json_mode = True
+        return content
+
+    async def _post_completion(
+        self, body: Dict[str, Any], *, probe_json_mode: bool = False
+    ) -> Optional[str]:
+        response = await post_with_retry(
+            self._client,
+            f"{self._base_url}/chat/completions",
+            content=orjson.dumps(body),
+            headers=self._headers,
+            timeout=self._timeout,
+            passthrough_statuses=_JSON_MODE_REJECTION_STATUSES if probe_json_mode else (),
+        )
+        if response is None:
+            return None
+        if response.status_code in _JSON_MODE_REJECTION_STATUSES:
+            raise _JSONModeRejectedError()
+        try:
+            data = orjson.loads(response.content)
+            return data["choices"][0]["message"]["content"].strip()
+        except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def _unwrap(parsed: Any, key: str) -> Any:
+        """Accept both bare arrays and JSON-mode objects wrapping them under ``key``."""
+
+        if isinstance(parsed, dict):
+            return parsed.get(key)
+        return parsed
+
+    async def _normalize_single(self, payload: List[str], model: str) -> Optional[List[str]]:
+        content = await self._complete(self._build_body(payload, model))
+        if content is None:
+            return None
+
+        try:
+            parsed = self._unwrap(orjson.loads(content), "memories")
+        except orjson.JSONDecodeError:
             pass
+        else:
+            # Any JSON reply settles here, like the batch path does. [] or all skip=true
+            # is a real answer (nothing durable, store nothing); only a reply outside the
+            # contract, such as an object without "memories", falls back to raw snippets.
+            if not isinstance(parsed, list):
+                return None
+            return self._extract_memories(parsed)
 
-        return payload
+        # Fallback to line-based parsing when JSON is unavailable
+        fallback = [
+            stripped
+            for line in content.splitlines()
+            if (stripped := _BULLET_PREFIX.sub("", line, count=1).strip())
+        ]
+        return fallback or None
 
-    async def ping(self) -> bool:
-        """Check credentials by issuing a tiny completion."""
+    async def _normalize_batch(
+        self, blocks: List[List[str]], model: str
+    ) -> Optional[List[List[str]]]:
+        content = await self._complete(self._build_batch_body(blocks, model))
+        if content is None:
+            return None
+        try:
+            parsed = self._unwrap(orjson.loads(content), "blocks")
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(parsed, list) or len(parsed) != len(blocks):
+            return None
+        if not all(isinstance(block, list) for block in parsed):
+            return None
+        # Empty blocks settle as [], exactly like _normalize_single, so concurrency
+        # never changes what a caller gets back (or what ends up cached).
+        return [self._extract_memories(block) for block in parsed]
 
+    # ------------------------------------------------------------------
+    # Micro-batching
+
+    async def _enqueue(
+        self, payload: List[str], model: str, tenant: Tuple[Optional[str], Optional[str]]
+    ) -> Optional[List[str]]:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker_loop is not loop:
+            self._queue = asyncio.Queue()
+            self._worker_loop = loop
+            self._worker = loop.create_task(self._batch_worker(self._queue))
+        assert self._queue is not None
+        future: asyncio.Future[Optional[List[str]]] = loop.create_future()
+        await self._queue.put(
+            _PendingRequest(texts=payload, model=model, tenant=tenant, future=future)
+        )
+        return await future
+
+    async def _batch_worker(self, queue: "asyncio.Queue[_PendingRequest]") -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+
+            # Never mix tenants in one prompt: block results are matched back by position only.
+            groups: Dict[Tuple[str, Optional[str], Optional[str]], List[_PendingRequest]] = {}
+            for pending in batch:
+                groups.setdefault((pending.model, *pending.tenant), []).append(pending)
+            for (model, _, _), group in groups.items():
+                task = loop.create_task(self._dispatch(group, model))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, group: List[_PendingRequest], model: str) -> None:
         try:
-            result = await self.normalize_memories(["ping"])
-            return bool(result)
-        except (httpx.HTTPError, RetryError):
-            return False
+            if len(group) == 1:
+                results = [await self._normalize_single(group[0].texts, model)]
+            else:
+                batched = await self._normalize_batch([pending.texts for pending in group], model)
+                if batched is None:
+                    # Model ignored the block contract; fall back to one call per caller.
+                    results = await asyncio.gather(
+                        *(self._normalize_single(pending.texts, model) for pending in group)
+                    )
+                else:
+                    results = list(batched)
+        except Exception as exc:  # pragma: no cover - surfaced to every waiting caller
+            for pending in group:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+
+        for pending, result in zip(group, results, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(result)
@@ -2,53 +2,210 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List
+import asyncio
+import base64
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import httpx
-from tenacity import AsyncRetrying, RetryError, stop_after_attempt, wait_fixed
+import orjson
+from cachetools import LRUCache
 
+from ..exceptions import EmbeddingDimensionError
 from ..utils import make_embedding_stub
+from .http import build_http_client, post_with_retry
+
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class TEIClient:
     """Async HTTP client for Hugging Face Text Embeddings Inference."""
 
-    def __init__(self, base_url: str, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        *,
+        max_batch: int = 32,
+        max_concurrency: int = 4,
+        dimensions: Optional[int] = None,
+        coalesce_window_seconds: float = 0.005,
+        cache_size: int = 1024,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
-        self._client = httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=3.0))
+        # Expected vector length; a different model behind tei_base_url is refused.
+        self._dimensions = dimensions
+        self._max_batch = max(max_batch, 1)
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._timeout = httpx.Timeout(timeout, connect=3.0)
+        self._owns_client = http_client is None
+        self._client = http_client or build_http_client()
+        self._coalesce_window = coalesce_window_seconds
+        self._queue: Optional[asyncio.Queue[Tuple[str, asyncio.Future[List[float]]]]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong references to in-flight dispatches; the loop itself only keeps weak ones.
+        self._dispatches: Set[asyncio.Task[None]] = set()
+        # text -> vector for texts TEI actually embedded; stub fallbacks are never cached.
+        self._cache: Optional[LRUCache[str, List[float]]] = (
+            LRUCache(maxsize=cache_size) if cache_size > 0 else None
+        )
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._worker = None
+            self._queue = None
+        if self._owns_client:
+            await self._client.aclose()
 
     async def embed(self, texts: Iterable[str]) -> List[List[float]]:
         payload = list(texts)
         if not payload:
             return []
 
-        request = {"input": payload}
+        # Embed each distinct text once and scatter vectors back to the original positions.
+        unique = list(dict.fromkeys(payload))
+        by_text: Dict[str, List[float]] = {}
+        if self._cache is not None:
+            cache = self._cache
+            for text in unique:
+                cached = cache.get(text)
+                if cached is not None:
+                    by_text[text] = cached
+            if by_text:
+                unique = [text for text in unique if text not in by_text]
+        if not unique:
+            return [by_text[text] for text in payload]
+
+        if len(unique) <= self._max_batch:
+            vectors = await self._embed_chunk(unique)
+        else:
+            # Keep each request within TEI's client batch limit and bound in-flight requests.
+            step = self._max_batch
+            chunks = [unique[i : i + step] for i in range(0, len(unique), step)]
+            results = await asyncio.gather(*(self._embed_chunk(chunk) for chunk in chunks))
+            vectors = [vector for chunk_vectors in results for vector in chunk_vectors]
+
+        if not by_text and len(unique) == len(payload):
+            return vectors
+        by_text.update(zip(unique, vectors, strict=True))
+        return [by_text[text] for text in payload]
+
+    async def embed_coalesced(self, text: str) -> List[float]:
+        """Embed a single text, sharing one TEI request with concurrent callers."""
+
+        if self._cache is not None:
+            cached = self._cache.get(text)
+            if cached is not None:
+                return cached
+        if self._coalesce_window <= 0:
+            return (await self.embed([text]))[0]
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker_loop is not loop:
+            self._queue = asyncio.Queue()
+            self._worker_loop = loop
+            self._worker = loop.create_task(self._coalesce_worker(self._queue))
+        assert self._queue is not None
+        future: asyncio.Future[List[float]] = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _coalesce_worker(
+        self, queue: "asyncio.Queue[Tuple[str, asyncio.Future[List[float]]]]"
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            # A lone waiter goes out at once; the window only applies under contention.
+            if not queue.empty():
+                deadline = loop.time() + self._coalesce_window
+                while len(batch) < self._max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                    except TimeoutError:
+                        break
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
 
+    async def _dispatch(self, batch: List[Tuple[str, "asyncio.Future[List[float]]"]]) -> None:
         try:
-            async for attempt in AsyncRetrying(  # type: ignore[no-untyped-call]
-                stop=stop_after_attempt(3), wait=wait_fixed(0.4)
-            ):
-                with attempt:
-                    response = await self._client.post(
-                        f"{self._base_url}/v1/embeddings",
-                        json=request,
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    return [item["embedding"] for item in data["data"]]
-        except (httpx.HTTPError, RetryError):
-            pass
+            vectors = await self.embed([text for text, _ in batch])
+        except Exception as exc:  # pragma: no cover - surfaced to every waiting caller
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            if not future.done():
+                future.set_result(vector)
+
+    async def _embed_chunk(self, chunk: List[str]) -> List[List[float]]:
+        request: Dict[str, Any] = {"input": chunk, "encoding_format": "base64"}
+
+        async with self._semaphore:
+            response = await post_with_retry(
+                self._client,
+                f"{self._base_url}/v1/embeddings",
+                delay=0.4,
+                multiplier=1.0,
+                content=orjson.dumps(request),
+                headers=JSON_HEADERS,
+                timeout=self._timeout,
+            )
+        if response is not None:
+            try:
+                data = orjson.loads(response.content)
+                vectors = [self._decode_embedding(item["embedding"]) for item in data["data"]]
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                vectors = None
+            if vectors is not None:
+                self._check_dimensions(vectors)
+                if self._cache is not None:
+                    self._cache.update(zip(chunk, vectors, strict=True))
+                return vectors
 
         # Fallback for local environments without TEI access: deterministic stub
-        return [make_embedding_stub(text) for text in payload]
-        raise RuntimeError("TEI embedding retries exhausted")
+        if self._dimensions:
+            return [make_embedding_stub(text, self._dimensions) for text in chunk]
+        return [make_embedding_stub(text) for text in chunk]
+
+    def _check_dimensions(self, vectors: List[List[float]]) -> None:
+        # A real answer of the wrong size is a misconfiguration, not an outage: falling back
+        # to stubs here would silently store and search pseudo-vectors.
+        if not self._dimensions:
+            return
+        for vector in vectors:
+            if len(vector) != self._dimensions:
+                raise EmbeddingDimensionError(
+                    f"TEI returned {len(vector)}-dimensional embeddings; "
+                    f"the collection expects {self._dimensions}"
+                )
+
+    @staticmethod
+    def _decode_embedding(raw: Any) -> List[float]:
+        """Decode a base64 little-endian float32 vector, accepting plain float lists too."""
+
+        if isinstance(raw, list):
+            return raw
+        vector = array("f", base64.b64decode(raw))
+        if sys.byteorder == "big":  # pragma: no cover - TEI emits little-endian
+            vector.byteswap()
+        return vector.tolist()
 
     async def ping(self) -> bool:
         try:
             vectors = await self.embed(["ping"])
             return bool(vectors and vectors[0])
-        except (httpx.HTTPError, RetryError):
+        except (httpx.HTTPError, EmbeddingDimensionError):
             return False
@@ -9,6 +9,11 @@ from typing import Any, Dict
 import yaml
 from pydantic import ValidationError
 
+try:  # libyaml binding is markedly faster when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - pure-Python PyYAML build
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 from .models import Settings
 
 CONFIG_ENV_VAR = "MEMORY_CONFIG_FILE"
@@ -19,7 +24,7 @@ def _load_file(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
     with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+        return yaml.load(handle, Loader=SafeLoader) or {}
 
 
 def _apply_env(target: Dict[str, Any], key: str, value: Any) -> None:
@@ -34,6 +39,8 @@ def _inject_env_overrides(raw: Dict[str, Any]) -> Dict[str, Any]:
     _apply_env(services, "tei_base_url", os.getenv("TEI_BASE_URL"))
     _apply_env(services, "openrouter_base_url", os.getenv("OPENROUTER_BASE_URL"))
     _apply_env(services, "qdrant_url", os.getenv("QDRANT_URL"))
+    _apply_env(services, "qdrant_grpc_port", os.getenv("QDRANT_GRPC_PORT"))
+    _apply_env(services, "qdrant_pool_size", os.getenv("QDRANT_POOL_SIZE"))
 
     security = raw.setdefault("security", {})
     shared_secret = os.getenv("MEMORY_SHARED_SECRET")
@@ -55,7 +62,7 @@ def load_settings(config_path: str | os.PathLike[str] | None = None) -> Settings
     hydrated = _inject_env_overrides(raw_config)
 
     try:
-        return Settings(**hydrated)
+        return Settings.model_validate(hydrated)
     except ValidationError as exc:  # pragma: no cover - delegated to callers
         raise RuntimeError(f"Invalid configuration: {exc}") from exc
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Dict, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, PositiveInt, validator
+from pydantic import BaseModel, Field, HttpUrl, PositiveInt, field_validator
 
 
 DEFAULT_SCOPES = ["prefs", "facts", "persona", "constraints"]
@@ -16,8 +16,18 @@ class WritePolicy(BaseModel):
     enabled_scopes: list[str] = Field(default_factory=lambda: DEFAULT_SCOPES.copy())
     min_chars: PositiveInt = 12
     deduplicate: bool = True
+    # Skip dedupe lookups for hashes a per-tenant Bloom filter has never seen.
+    # Only safe when this process is the sole writer to the collection.
+    dedupe_bloom: bool = False
+    # Treat a new text as a duplicate when the same user already has a memory in the scope
+    # at or above this cosine similarity; costs one batched search per add. None disables.
+    near_duplicate_threshold: Optional[float] = Field(default=None, gt=0.0, le=1.0)
     normalize_with_llm: bool = True
     max_batch: PositiveInt = 32
+    llm_cache_size: int = Field(default=1024, ge=0)
+    llm_cache_ttl_seconds: PositiveInt = 1800
+    # Opt-in: > 0 makes every normalisation wait this long for same-tenant callers to share it.
+    llm_batch_window_ms: int = Field(default=0, ge=0)
 
 
 class RetrievalPolicy(BaseModel):
@@ -35,6 +45,9 @@ class CollectionPolicy(BaseModel):
     vector_size: PositiveInt = 768
     distance: str = "Cosine"
     on_disk_payload: bool = True
+    # int8 scalar quantization kept in RAM; applied when the collection is created.
+    scalar_quantization: bool = True
+    quantization_oversampling: float = Field(default=2.0, ge=1.0)
 
 
 class TenantOverrides(BaseModel):
@@ -69,7 +82,8 @@ class CoreConfig(BaseModel):
     embedding_dims: PositiveInt = 768
     organisations: Dict[str, OrgConfig] = Field(default_factory=dict)
 
-    @validator("embedding_dims")
+    @field_validator("embedding_dims")
+    @classmethod
     def validate_dims(cls, value: int) -> int:  # noqa: D417
         if value not in (128, 256, 512, 768):
             raise ValueError("embedding dimensions must be one of 128, 256, 512, 768")
@@ -92,8 +106,17 @@ class ExternalServiceConfig(BaseModel):
     openrouter_api_key: str = Field(..., repr=False)
     openrouter_base_url: HttpUrl = HttpUrl("https://openrouter.ai/api/v1")
     tei_base_url: HttpUrl = HttpUrl("http://localhost:3000")
+    # Vectors kept in-process per text so repeated adds and queries skip TEI; 0 disables.
+    tei_cache_size: int = Field(default=1024, ge=0)
+    # Texts per TEI request, and how long single embeds wait to share one; 0 ms disables.
+    tei_max_batch: PositiveInt = 32
+    tei_coalesce_window_ms: int = Field(default=5, ge=0)
     qdrant_url: HttpUrl = HttpUrl("http://localhost:6333")
     qdrant_api_key: Optional[str] = Field(default=None, repr=False)
+    qdrant_prefer_grpc: bool = True
+    qdrant_grpc_port: PositiveInt = 6334
+    # Concurrent gRPC channels / REST connections; qdrant-client defaults to 3.
+    qdrant_pool_size: PositiveInt = 64
     qdrant_collection: str = "memories"
 
 
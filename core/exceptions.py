@@ -24,3 +24,7 @@ class DuplicateMemoryError(MemoryServiceError):
 class NotFoundError(MemoryServiceError):
     """Raised when a memory cannot be retrieved."""
 
+
+
+class EmbeddingDimensionError(MemoryServiceError):
+    """Raised when the embedding service returns vectors of the wrong length."""
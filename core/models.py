@@ -4,10 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Iterable, List, Optional
+from typing import Iterator, List, Optional
 
 from pydantic import BaseModel, Field
 
+from .utils import utcnow
+
 DEFAULT_TTL_DAYS = 365
 
 
@@ -34,8 +36,8 @@ class MemoryPayload(BaseModel):
     tags: List[str] = Field(default_factory=list)
     source: Optional[str] = None
     ttl_days: int = Field(default=DEFAULT_TTL_DAYS, ge=1)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     deleted: bool = False
     text: str = ""
     dedupe_hash: Optional[str] = None
@@ -85,14 +87,23 @@ class MemoryAddRequest(BaseModel):
     source: Optional[str] = None
     ttl_days: int = DEFAULT_TTL_DAYS
 
-    def iter_texts(self) -> Iterable[str]:
+    def iter_texts(self, *, min_chars: int = 1) -> Iterator[str]:
+        """Yield stripped, distinct candidate texts of at least ``min_chars`` characters."""
+
+        seen: set[str] = set()
         if self.text:
-            yield self.text
-        if self.messages:
-            for message in self.messages:
-                content = message.get("content")
-                if content:
-                    yield content
+            text = self.text.strip()
+            if len(text) >= min_chars:
+                seen.add(text)
+                yield text
+        for message in self.messages or ():
+            content = message.get("content")
+            if not content or not isinstance(content, str):
+                continue
+            text = content.strip()
+            if len(text) >= min_chars and text not in seen:
+                seen.add(text)
+                yield text
 
 
 class SearchRequest(BaseModel):
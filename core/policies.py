@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from .config.models import WritePolicy
 
 
@@ -18,10 +20,18 @@ class WritePolicyEngine:
             return False
         return True
 
+    @property
+    def min_chars(self) -> int:
+        return self._policy.min_chars
+
     @property
     def deduplicate(self) -> bool:
         return self._policy.deduplicate
 
+    @property
+    def near_duplicate_threshold(self) -> Optional[float]:
+        return self._policy.near_duplicate_threshold
+
     @property
     def normalize_with_llm(self) -> bool:
         return self._policy.normalize_with_llm
@@ -3,27 +3,50 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Optional, Tuple
+import hashlib
+import hmac
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import jwt
 import httpx
-from jwt import InvalidTokenError
+from cachetools import TTLCache
+from jwt import InvalidKeyError, InvalidTokenError
 
 from .config.models import SecurityConfig
 from .exceptions import AuthenticationError, AuthorizationError
 
+BEARER_PREFIX = "Bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
+NEGATIVE_CACHE_SIZE = 4096
+NEGATIVE_CACHE_TTL_SECONDS = 60.0
+# RFC 7518 makes "alg" optional on a JWK; RSA keys without it are used for RS256.
+DEFAULT_RSA_JWK_ALGORITHM = "RS256"
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
 
 class SecurityService:
     """Validates bearer tokens and enforces tenancy headers."""
 
     def __init__(self, config: SecurityConfig) -> None:
         self._config = config
-        # Interpret shared_secrets as mapping org_id -> token string
-        self._token_map = {token: org_id for org_id, token in config.shared_secrets.items()}
-        self._jwks_cache: Optional[Dict[str, str]] = None
+        # Interpret shared_secrets as mapping org_id -> token string. Lookups are keyed by
+        # the token digest and confirmed with compare_digest, so timing reveals no token bytes.
+        self._token_map: Dict[bytes, Tuple[str, bytes]] = {
+            _token_digest(token): (org_id, token.encode("utf-8"))
+            for org_id, token in config.shared_secrets.items()
+        }
+        # kid -> (prepared public key, algorithm); JWKs are parsed once per fetch.
+        self._jwks_cache: Optional[Dict[str, Tuple[Any, str]]] = None
         self._lock = asyncio.Lock()
+        # Digests of recently rejected JWTs so replayed bad tokens skip PyJWT entirely.
+        self._rejected_tokens: TTLCache[bytes, bool] = TTLCache(
+            maxsize=NEGATIVE_CACHE_SIZE, ttl=NEGATIVE_CACHE_TTL_SECONDS
+        )
 
-    async def _fetch_jwks(self) -> Dict[str, str]:
+    async def _fetch_jwks(self) -> Dict[str, Tuple[Any, str]]:
         if not self._config.jwk_url:
             return {}
         async with self._lock:
@@ -33,45 +56,74 @@ class SecurityService:
                 response = await client.get(str(self._config.jwk_url))
                 response.raise_for_status()
                 body = response.json()
-                keys = {item["kid"]: item for item in body.get("keys", [])}
+                keys = self._prepare_jwks(body.get("keys", []))
                 self._jwks_cache = keys
                 return keys
 
+    @staticmethod
+    def _prepare_jwks(items: Iterable[Any]) -> Dict[str, Tuple[Any, str]]:
+        """Parse the RSA keys of a JWKS; unusable entries are skipped so the rest verify."""
+
+        prepared: Dict[str, Tuple[Any, str]] = {}
+        for item in items:
+            if not isinstance(item, dict) or item.get("kty") != "RSA" or not item.get("kid"):
+                continue
+            try:
+                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(item)
+            except (InvalidKeyError, KeyError, TypeError, ValueError):
+                continue
+            prepared[item["kid"]] = (public_key, item.get("alg") or DEFAULT_RSA_JWK_ALGORITHM)
+        return prepared
+
     async def authenticate(self, authorization: Optional[str]) -> Optional[str]:
         if not authorization:
             if self._token_map:
                 raise AuthenticationError("missing bearer token")
             return None
 
-        prefix = "Bearer "
-        if not authorization.startswith(prefix):
+        if not authorization.startswith(BEARER_PREFIX):
             raise AuthenticationError("authorization header must use Bearer scheme")
-        token = authorization[len(prefix) :].strip()
+        token = authorization[BEARER_PREFIX_LEN:].strip()
 
-        if token in self._token_map:
-            return self._token_map[token]
+        shared = self._token_map.get(_token_digest(token))
+        if shared is not None and hmac.compare_digest(shared[1], token.encode("utf-8")):
+            return shared[0]
 
         if self._config.jwk_url:
-            jwks = await self._fetch_jwks()
-            header = jwt.get_unverified_header(token)
-            kid = header.get("kid")
-            key = jwks.get(kid)
-            if not key:
-                raise AuthenticationError("unknown signing key")
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+            if digest in self._rejected_tokens:
+                raise AuthenticationError("invalid JWT")
             try:
-                payload = jwt.decode(
-                    token,
-                    key=jwt.algorithms.RSAAlgorithm.from_jwk(key),
-                    audience=self._config.jwt_audience,
-                    issuer=self._config.jwt_issuer,
-                    algorithms=[key["alg"]],
-                )
-            except InvalidTokenError as exc:  # pragma: no cover - delegated to PyJWT
-                raise AuthenticationError("invalid JWT") from exc
-            return str(payload.get("org_id"))
+                return await self._authenticate_jwt(token)
+            except AuthenticationError:
+                self._rejected_tokens[digest] = True
+                raise
 
         raise AuthenticationError("unauthorized token")
 
+    async def _authenticate_jwt(self, token: str) -> str:
+        jwks = await self._fetch_jwks()
+        try:
+            header = jwt.get_unverified_header(token)
+        except InvalidTokenError as exc:
+            raise AuthenticationError("invalid JWT") from exc
+        kid = header.get("kid")
+        prepared = jwks.get(kid)
+        if not prepared:
+            raise AuthenticationError("unknown signing key")
+        public_key, algorithm = prepared
+        try:
+            payload = jwt.decode(
+                token,
+                key=public_key,
+                audience=self._config.jwt_audience,
+                issuer=self._config.jwt_issuer,
+                algorithms=[algorithm],
+            )
+        except InvalidTokenError as exc:  # pragma: no cover - delegated to PyJWT
+            raise AuthenticationError("invalid JWT") from exc
+        return str(payload.get("org_id"))
+
     def validate_tenancy(self, derived_org_id: Optional[str], header_org_id: Optional[str], header_agent_id: Optional[str]) -> Tuple[str, str]:
         if self._config.enforce_headers:
             if not header_org_id:
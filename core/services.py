@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from cachetools import LRUCache
 
 try:
     from qdrant_client import AsyncQdrantClient
@@ -15,7 +21,7 @@ except ImportError:  # pragma: no cover - allows unit tests without qdrant insta
         async def close(self) -> None:  # type: ignore[empty-body]
             return None
 
-from .clients import OpenRouterClient, TEIClient
+from .clients import OpenRouterClient, TEIClient, build_http_client
 from .config.models import CollectionPolicy, OrgConfig, Settings, TenantOverrides
 from .exceptions import NotFoundError
 from .models import (
@@ -29,25 +35,52 @@ from .models import (
 )
 from .policies import WritePolicyEngine
 from .storage import QdrantRepository
-from .utils import apply_time_decay, compute_hash, make_id
+from .utils import apply_time_decay_batch, compute_hashes, make_id, utcnow
+
+TENANT_CACHE_SIZE = 4096
 
 
 class MemoryCore:
     """High-level orchestration of the memory workflow."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self, settings: Settings, *, http_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
         self._settings = settings
         services = settings.services
-        self._tei = TEIClient(str(services.tei_base_url))
+        # A caller-supplied transport is owned (and closed) by the caller.
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or build_http_client()
+        self._tei = TEIClient(
+            str(services.tei_base_url),
+            dimensions=settings.core.collection.vector_size,
+            cache_size=services.tei_cache_size,
+            max_batch=services.tei_max_batch,
+            coalesce_window_seconds=services.tei_coalesce_window_ms / 1000.0,
+            http_client=self._http_client,
+        )
         self._llm = OpenRouterClient(
             api_key=services.openrouter_api_key,
             base_url=str(services.openrouter_base_url),
             model=settings.core.model,
+            cache_size=settings.core.write.llm_cache_size,
+            cache_ttl_seconds=settings.core.write.llm_cache_ttl_seconds,
+            batch_window_seconds=settings.core.write.llm_batch_window_ms / 1000.0,
+            max_batch=settings.core.write.max_batch,
+            http_client=self._http_client,
         )
         self._qdrant_client = AsyncQdrantClient(
-            url=str(services.qdrant_url), api_key=services.qdrant_api_key
+            url=str(services.qdrant_url),
+            api_key=services.qdrant_api_key,
+            prefer_grpc=services.qdrant_prefer_grpc,
+            grpc_port=services.qdrant_grpc_port,
+            pool_size=services.qdrant_pool_size,
         )
         self._repositories: Dict[Tuple[str, int], QdrantRepository] = {}
+        # (org_id, agent_id) -> resolved overrides, write policy engine, default top_k
+        self._tenant_cache: LRUCache[
+            Tuple[str, Optional[str]], Tuple[TenantOverrides, WritePolicyEngine, int]
+        ] = LRUCache(maxsize=TENANT_CACHE_SIZE)
         base_collection = settings.core.collection
         if services.qdrant_collection and services.qdrant_collection != base_collection.name:
             base_collection = CollectionPolicy(
@@ -55,20 +88,44 @@ class MemoryCore:
                 vector_size=base_collection.vector_size,
                 distance=base_collection.distance,
                 on_disk_payload=base_collection.on_disk_payload,
+                scalar_quantization=base_collection.scalar_quantization,
+                quantization_oversampling=base_collection.quantization_oversampling,
             )
         self._default_collection = base_collection
 
     async def startup(self) -> None:
-        await self._ensure_repository(self._default_collection)
+        await asyncio.gather(
+            self._warm_dns(),
+            self._ensure_repository(self._default_collection),
+        )
 
     async def shutdown(self) -> None:
         await self._tei.close()
         await self._llm.close()
+        if self._owns_http_client:
+            await self._http_client.aclose()
         await self._qdrant_client.close()
 
     # ------------------------------------------------------------------
     # Configuration helpers
 
+    async def _warm_dns(self) -> None:
+        """Resolve outbound hosts once so the first request skips a cold DNS lookup."""
+
+        services = self._settings.services
+        loop = asyncio.get_running_loop()
+        lookups = []
+        for url in (services.tei_base_url, services.openrouter_base_url, services.qdrant_url):
+            parts = urlsplit(str(url))
+            if parts.hostname:
+                port = parts.port or (443 if parts.scheme == "https" else 80)
+                lookups.append(loop.getaddrinfo(parts.hostname, port))
+        # Best effort: unresolved hosts surface through the regular client fallbacks.
+        try:
+            await asyncio.wait_for(asyncio.gather(*lookups, return_exceptions=True), timeout=2.0)
+        except TimeoutError:
+            pass
+
     async def _ensure_repository(self, policy: CollectionPolicy) -> QdrantRepository:
         key = (policy.name, policy.vector_size)
         if key not in self._repositories:
@@ -76,6 +133,9 @@ class MemoryCore:
                 client=self._qdrant_client,
                 collection_name=policy.name,
                 vector_size=policy.vector_size,
+                dedupe_bloom=self._settings.core.write.dedupe_bloom,
+                scalar_quantization=policy.scalar_quantization,
+                quantization_oversampling=policy.quantization_oversampling,
             )
         repo = self._repositories[key]
         await repo.ensure_collection()
@@ -85,7 +145,30 @@ class MemoryCore:
         collection = overrides.collection or self._default_collection
         return await self._ensure_repository(collection)
 
+    def invalidate(self) -> None:
+        """Drop cached per-tenant resolution, e.g. after settings are reloaded."""
+
+        self._tenant_cache.clear()
+
+    def _tenant_config(
+        self, org_id: str, agent_id: Optional[str]
+    ) -> Tuple[TenantOverrides, WritePolicyEngine, int]:
+        key = (org_id, agent_id)
+        cached = self._tenant_cache.get(key)
+        if cached is None:
+            overrides = self._compute_overrides(org_id, agent_id)
+            cached = (
+                overrides,
+                self._build_policy_engine(overrides),
+                self._resolve_top_k(overrides),
+            )
+            self._tenant_cache[key] = cached
+        return cached
+
     def _resolve_overrides(self, org_id: str, agent_id: Optional[str]) -> TenantOverrides:
+        return self._tenant_config(org_id, agent_id)[0]
+
+    def _compute_overrides(self, org_id: str, agent_id: Optional[str]) -> TenantOverrides:
         core = self._settings.core
         org_config: Optional[OrgConfig] = core.organisations.get(org_id)
         if not org_config:
@@ -98,8 +181,8 @@ class MemoryCore:
             model=org_config.model,
             embedding_dims=org_config.embedding_dims,
         )
-        if agent_id and agent_id in org_config.agents:
-            agent = org_config.agents[agent_id]
+        agent = org_config.agents.get(agent_id) if agent_id else None
+        if agent:
             resolved.write = agent.write or resolved.write
             resolved.retrieval = agent.retrieval or resolved.retrieval
             resolved.collection = agent.collection or resolved.collection
@@ -115,21 +198,30 @@ class MemoryCore:
         retrieval = overrides.retrieval or self._settings.core.retrieval
         return retrieval.top_k
 
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        # Single-text adds are the common case; let concurrent ones share a TEI request.
+        if len(texts) == 1:
+            return [await self._tei.embed_coalesced(texts[0])]
+        return await self._tei.embed(texts)
+
     # ------------------------------------------------------------------
     # Public API
 
     async def add(self, org_id: str, agent_id: str, request: MemoryAddRequest) -> List[MemoryRecord]:
-        overrides = self._resolve_overrides(org_id, agent_id)
+        overrides, policy_engine, _ = self._tenant_config(org_id, agent_id)
         repository = await self._get_repository(overrides)
-        policy_engine = self._build_policy_engine(overrides)
 
-        candidate_texts = [text.strip() for text in request.iter_texts() if text.strip()]
+        # The normalisation prompt also skips snippets shorter than min_chars, so drop them
+        # up front.
+        candidate_texts = list(request.iter_texts(min_chars=policy_engine.min_chars))
         if not candidate_texts:
             return []
 
         model_name = overrides.model or self._settings.core.model
         if policy_engine.normalize_with_llm:
-            candidate_texts = await self._llm.normalize_memories(candidate_texts, model=model_name)
+            candidate_texts = await self._llm.normalize_memories(
+                candidate_texts, model=model_name, org_id=org_id, agent_id=agent_id
+            )
 
         texts = [
             text for text in candidate_texts if policy_engine.should_persist(text, request.scope or MemoryScope.FACTS.value)
@@ -139,16 +231,34 @@ class MemoryCore:
 
         new_records: List[MemoryRecord] = []
         all_records: List[MemoryRecord] = []
-        vectors = await self._tei.embed(texts)
+        hashes = compute_hashes(org_id, agent_id, request.user_id, texts)
+        existing_by_hash: Dict[str, MemoryRecord] = {}
+        if policy_engine.deduplicate:
+            # Embedding and the dedupe lookup are independent, so overlap the round trips.
+            # One filtered lookup covers the whole batch instead of a scroll per text.
+            vectors, existing_by_hash = await asyncio.gather(
+                self._embed_texts(texts),
+                repository.find_by_hashes(hashes, org_id, agent_id),
+            )
+        else:
+            vectors = await self._embed_texts(texts)
 
-        for text, vector in zip(texts, vectors):
+        near_duplicates: Dict[int, MemoryRecord] = {}
+        threshold = policy_engine.near_duplicate_threshold
+        if threshold is not None:
+            near_duplicates = await self._find_near_duplicates(
+                repository, org_id, agent_id, request, vectors, hashes, existing_by_hash, threshold
+            )
+
+        # One timestamp per request so a batch is stamped consistently.
+        now = utcnow()
+        rows = zip(texts, vectors, hashes, strict=True)
+        for index, (text, vector, dedupe_hash) in enumerate(rows):
             memory_id = make_id(org_id, agent_id, text)
-            dedupe_hash = compute_hash(org_id, agent_id, request.user_id, text)
-            if policy_engine.deduplicate:
-                existing = await repository.find_by_hash(dedupe_hash, org_id, agent_id)
-                if existing:
-                    all_records.append(existing)
-                    continue
+            existing = existing_by_hash.get(dedupe_hash) or near_duplicates.get(index)
+            if existing:
+                all_records.append(existing)
+                continue
             payload = MemoryPayload(
                 org_id=org_id,
                 agent_id=agent_id,
@@ -157,12 +267,17 @@ class MemoryCore:
                 tags=request.tags,
                 source=request.source,
                 ttl_days=request.ttl_days,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+                created_at=now,
+                updated_at=now,
                 text=text,
                 dedupe_hash=dedupe_hash,
             )
-            record = MemoryRecord(id=memory_id, text=text, payload=payload, vector=vector)
+            # The payload stays validated: requests may arrive unvalidated and it enforces
+            # ttl_days >= 1. The wrapper only adds our id and the TEI vector, so skip
+            # re-checking it.
+            record = MemoryRecord.model_construct(
+                id=memory_id, text=text, payload=payload, vector=vector
+            )
             new_records.append(record)
             all_records.append(record)
 
@@ -170,16 +285,53 @@ class MemoryCore:
             await repository.upsert(new_records)
         return all_records
 
+    @staticmethod
+    async def _find_near_duplicates(
+        repository: QdrantRepository,
+        org_id: str,
+        agent_id: str,
+        request: MemoryAddRequest,
+        vectors: Sequence[List[float]],
+        hashes: Sequence[str],
+        existing_by_hash: Dict[str, MemoryRecord],
+        threshold: float,
+    ) -> Dict[int, MemoryRecord]:
+        """Map text positions to stored memories of the same user that are near-identical."""
+
+        # Only texts that survived the exact-hash check need a neighbour lookup.
+        pending = [
+            index for index, dedupe_hash in enumerate(hashes) if dedupe_hash not in existing_by_hash
+        ]
+        if not pending:
+            return {}
+        scope = request.scope or MemoryScope.FACTS.value
+        results = await repository.search_batch(
+            [vectors[index] for index in pending],
+            limits=[1] * len(pending),
+            org_id=org_id,
+            agent_id=agent_id,
+            scopes=[scope] * len(pending),
+            tags=[None] * len(pending),
+        )
+        matches: Dict[int, MemoryRecord] = {}
+        for index, hits in zip(pending, results, strict=True):
+            if hits and hits[0].score >= threshold and hits[0].payload.user_id == request.user_id:
+                hit = hits[0]
+                matches[index] = MemoryRecord.model_construct(
+                    id=hit.id, text=hit.text, payload=hit.payload
+                )
+        return matches
+
     async def search(
         self,
         org_id: str,
         agent_id: str,
         request: SearchRequest,
     ) -> List[MemoryHit]:
-        overrides = self._resolve_overrides(org_id, agent_id)
+        overrides, _, default_top_k = self._tenant_config(org_id, agent_id)
         repository = await self._get_repository(overrides)
-        top_k = request.k or self._resolve_top_k(overrides)
-        vector = (await self._tei.embed([request.query]))[0]
+        top_k = request.k or default_top_k
+        vector = await self._tei.embed_coalesced(request.query)
         hits = await repository.search_with_reranker(
             vector,
             limit=top_k,
@@ -197,26 +349,44 @@ class MemoryCore:
                 scope=request.scope,
                 tags=request.tags or None,
             )
-            now = datetime.utcnow()
-            adjusted: List[MemoryHit] = []
-            for hit in raw_hits:
-                payload = hit.payload
-                score = apply_time_decay(hit.score, payload.created_at, now)
-                adjusted.append(MemoryHit(id=hit.id, score=score, text=hit.text, payload=payload))
-            adjusted.sort(key=lambda h: h.score, reverse=True)
-            return adjusted
-
-        hits.sort(key=lambda h: h.score, reverse=True)
+            return self._apply_decay(raw_hits, utcnow(), top_k)
+
+        # The formula query already ranks by decayed score server-side.
         return hits
 
+    @staticmethod
+    def _apply_decay(
+        raw_hits: Sequence[MemoryHit], now: datetime, limit: Optional[int] = None
+    ) -> List[MemoryHit]:
+        scores = apply_time_decay_batch(
+            (hit.score for hit in raw_hits),
+            (hit.payload.created_at for hit in raw_hits),
+            now,
+        )
+        adjusted = (
+            MemoryHit.model_construct(id=hit.id, score=score, text=hit.text, payload=hit.payload)
+            for hit, score in zip(raw_hits, scores, strict=True)
+        )
+        # Bounded heap selection: O(n log k) and no intermediate list to re-sort.
+        return heapq.nlargest(limit or len(raw_hits), adjusted, key=lambda h: h.score)
+
     async def update(self, org_id: str, agent_id: str, memory_id: str, request: UpdateMemoryRequest) -> MemoryRecord:
         repository = await self._get_repository(self._resolve_overrides(org_id, agent_id))
-        record = await repository.get(memory_id)
-        if not record:
-            raise NotFoundError("memory not found")
-        payload = record.payload
-        if payload.org_id != org_id or payload.agent_id != agent_id:
-            raise NotFoundError("memory not found")
+        # Start re-embedding while the record is fetched; dropped if the lookup fails.
+        embed_task = (
+            asyncio.ensure_future(self._tei.embed_coalesced(request.text)) if request.text else None
+        )
+        try:
+            record = await repository.get(memory_id)
+            if not record:
+                raise NotFoundError("memory not found")
+            payload = record.payload
+            if payload.org_id != org_id or payload.agent_id != agent_id:
+                raise NotFoundError("memory not found")
+        except BaseException:
+            if embed_task is not None:
+                embed_task.cancel()
+            raise
 
         if request.text:
             record.text = request.text
@@ -228,12 +398,11 @@ class MemoryCore:
             payload.ttl_days = request.ttl_days
         if request.deleted is not None:
             payload.deleted = request.deleted
-        payload.updated_at = datetime.utcnow()
+        payload.updated_at = utcnow()
         payload.text = record.text
 
-        if request.text:
-            vector = (await self._tei.embed([record.text]))[0]
-            record.vector = vector
+        if embed_task is not None:
+            record.vector = await embed_task
             await repository.upsert([record])
         else:
             await repository.set_payload(record)
@@ -241,11 +410,8 @@ class MemoryCore:
 
     async def delete(self, org_id: str, agent_id: str, memory_id: str, *, hard: bool = False) -> None:
         repository = await self._get_repository(self._resolve_overrides(org_id, agent_id))
-        record = await repository.get(memory_id)
-        if not record:
-            raise NotFoundError("memory not found")
-        payload = record.payload
-        if payload.org_id != org_id or payload.agent_id != agent_id:
+        # The tenancy check only needs the owner, not the whole payload.
+        if await repository.get_owner(memory_id) != (org_id, agent_id):
             raise NotFoundError("memory not found")
         if hard:
             await repository.delete(memory_id)
@@ -286,15 +452,11 @@ class MemoryCore:
         if not memory_ids:
             return
         repository = await self._get_repository(self._resolve_overrides(org_id, agent_id))
+        # The tenant filter is applied server-side, so foreign ids are left untouched.
         if hard:
-            await repository.delete_many(memory_ids)
+            await repository.delete_many(memory_ids, org_id, agent_id)
             return
-        records = await repository.get_many(memory_ids)
-        for record in records:
-            if record.payload.org_id == org_id and record.payload.agent_id == agent_id:
-                record.payload.deleted = True
-                record.payload.updated_at = datetime.utcnow()
-                await repository.set_payload(record)
+        await repository.soft_delete_many(memory_ids, org_id, agent_id)
 
     async def search_text(
         self,
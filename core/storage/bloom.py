@@ -0,0 +1,43 @@
+"""Compact Bloom filter used to skip dedupe lookups for unseen hashes."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter with double hashing over a BLAKE2b digest."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self._size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self._hash_count = max(int(round(self._size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self._size
+        return ((first + i * second) % size for i in range(self._hash_count))
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
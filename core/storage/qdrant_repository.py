@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
-from typing import Any, Iterable, List, Optional, TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from cachetools import LRUCache
 
 if TYPE_CHECKING:  # pragma: no cover - type checking only
     from qdrant_client import AsyncQdrantClient
@@ -20,8 +24,10 @@ except ImportError:  # pragma: no cover
         Distance=SimpleNamespace(COSINE="Cosine"),
         PointStruct=lambda *args, **kwargs: SimpleNamespace(id="", payload={}, vector=None),
         FieldCondition=lambda *args, **kwargs: None,
+        HasIdCondition=lambda *args, **kwargs: None,
         MatchValue=lambda *args, **kwargs: None,
         MatchAny=lambda *args, **kwargs: None,
+        MatchText=lambda *args, **kwargs: None,
         Filter=lambda *args, **kwargs: None,
         PointIdsList=lambda *args, **kwargs: None,
         UpdateStatus=SimpleNamespace(COMPLETED="completed"),
@@ -30,10 +36,19 @@ except ImportError:  # pragma: no cover
         KeywordIndexParams=lambda *args, **kwargs: None,
         BoolIndexParams=lambda *args, **kwargs: None,
         DatetimeIndexParams=lambda *args, **kwargs: None,
+        TextIndexParams=lambda *args, **kwargs: None,
         KeywordIndexType=SimpleNamespace(KEYWORD="keyword"),
         BoolIndexType=SimpleNamespace(BOOL="bool"),
         DatetimeIndexType=SimpleNamespace(DATETIME="datetime"),
+        TextIndexType=SimpleNamespace(TEXT="text"),
+        TokenizerType=SimpleNamespace(WORD="word"),
+        ScalarQuantization=lambda *args, **kwargs: None,
+        ScalarQuantizationConfig=lambda *args, **kwargs: None,
+        ScalarType=SimpleNamespace(INT8="int8"),
+        SearchParams=lambda *args, **kwargs: SimpleNamespace(**kwargs),
+        QuantizationSearchParams=lambda *args, **kwargs: SimpleNamespace(**kwargs),
         Prefetch=lambda *args, **kwargs: SimpleNamespace(**kwargs),
+        QueryRequest=lambda *args, **kwargs: SimpleNamespace(**kwargs),
         NearestQuery=lambda *args, **kwargs: SimpleNamespace(**kwargs),
         FormulaQuery=lambda *args, **kwargs: SimpleNamespace(**kwargs),
         MultExpression=lambda *args, **kwargs: SimpleNamespace(**kwargs),
@@ -44,35 +59,145 @@ except ImportError:  # pragma: no cover
     )
 
 from ..models import MemoryHit, MemoryPayload, MemoryRecord
-from ..utils import TIME_DECAY_HALF_LIFE_DAYS
+from ..utils import TIME_DECAY_HALF_LIFE_DAYS, utcnow
+from .bloom import BloomFilter
+
+_PAYLOAD_FIELDS = tuple(MemoryPayload.model_fields)
+_REQUIRED_PAYLOAD_FIELDS = frozenset(
+    name for name, field in MemoryPayload.model_fields.items() if field.is_required()
+)
+# Above this many points, upsert point building moves to a worker thread.
+PAYLOAD_THREAD_THRESHOLD = 64
+# Large writes are split into batches of this size with a bounded number in flight.
+UPSERT_BATCH_SIZE = 32
+UPSERT_CONCURRENCY = 2
+# Page size used when warming a tenant's dedupe Bloom filter from Qdrant.
+BLOOM_WARM_PAGE_SIZE = 1024
+# Tenant filters kept per repository (~120 KB each); agent ids come from client headers.
+BLOOM_TENANT_CACHE_SIZE = 128
+
+
+class _TenantBloomCache(LRUCache):
+    """LRU of tenant Bloom filters that drops a tenant's warm-up lock with its filter."""
+
+    def __init__(self, maxsize: int, locks: Dict[Tuple[str, str], asyncio.Lock]) -> None:
+        super().__init__(maxsize=maxsize)
+        self._locks = locks
+
+    def popitem(self) -> Tuple[Tuple[str, str], BloomFilter]:
+        key, bloom = super().popitem()
+        self._locks.pop(key, None)
+        return key, bloom
+
+
+@lru_cache(maxsize=2048)
+def _tenant_conditions(org_id: str, agent_id: str) -> Tuple[rest.FieldCondition, ...]:
+    """Shared org/agent conditions; filter models are never mutated after construction."""
+
+    return (
+        rest.FieldCondition(key="org_id", match=rest.MatchValue(value=org_id)),
+        rest.FieldCondition(key="agent_id", match=rest.MatchValue(value=agent_id)),
+    )
+
+
+_NOT_DELETED = rest.FieldCondition(key="deleted", match=rest.MatchValue(value=False))
+
+
+def _payload_from_dict(raw: Dict[str, Any]) -> MemoryPayload:
+    """Build a payload read back from Qdrant without full validation.
+
+    Points are only written through ``upsert``/``set_payload`` from already
+    validated models, so the read path trusts them and only parses timestamps.
+    Anything that does not look like one of our payloads is validated normally.
+    """
+
+    if not _REQUIRED_PAYLOAD_FIELDS.issubset(raw):
+        return MemoryPayload.model_validate(raw)
+    data = {name: raw[name] for name in _PAYLOAD_FIELDS if name in raw}
+    try:
+        for name in ("created_at", "updated_at"):
+            value = data.get(name)
+            if isinstance(value, str):
+                data[name] = datetime.fromisoformat(value)
+    except ValueError:
+        return MemoryPayload.model_validate(raw)
+    return MemoryPayload.model_construct(**data)
 
 
 class QdrantRepository:
     """Repository for reading and writing memories in Qdrant."""
 
-    def __init__(self, client: AsyncQdrantClient, collection_name: str, vector_size: int) -> None:
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        collection_name: str,
+        vector_size: int,
+        *,
+        dedupe_bloom: bool = False,
+        bloom_cache_size: int = BLOOM_TENANT_CACHE_SIZE,
+        scalar_quantization: bool = True,
+        quantization_oversampling: float = 2.0,
+    ) -> None:
         self._client = client
         self._collection = collection_name
         self._vector_size = vector_size
+        self._scalar_quantization = scalar_quantization
+        # int8 candidates are rescored against the original vectors to keep recall.
+        self._search_params = (
+            rest.SearchParams(
+                quantization=rest.QuantizationSearchParams(
+                    rescore=True,
+                    oversampling=quantization_oversampling,
+                )
+            )
+            if scalar_quantization
+            else None
+        )
         self._reranker_available: Optional[bool] = None
         self._time_decay_half_life_days = TIME_DECAY_HALF_LIFE_DAYS
+        # (org_id, agent_id) -> Bloom filter of known dedupe hashes; opt-in because
+        # writes from other processes are only seen after a restart.
+        self._dedupe_bloom = dedupe_bloom
+        self._bloom_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._hash_blooms = _TenantBloomCache(max(bloom_cache_size, 1), self._bloom_locks)
+        # Collection bootstrap runs once per repository; concurrent first callers share it.
+        self._ensured = False
+        self._ensure_lock = asyncio.Lock()
 
     async def ensure_collection(self) -> None:
         """Ensure the default collection and required payload indexes exist."""
 
-        collections = await self._client.get_collections()
-        names = {collection.name for collection in collections.collections}
-        if self._collection not in names:
-            await self._client.create_collection(
-                collection_name=self._collection,
-                vectors_config=rest.VectorParams(
-                    size=self._vector_size,
-                    distance=rest.Distance.COSINE,
-                ),
-                on_disk_payload=True,
-            )
+        if self._ensured:
+            return
+        async with self._ensure_lock:
+            if self._ensured:
+                return
+            collections = await self._client.get_collections()
+            names = {collection.name for collection in collections.collections}
+            if self._collection not in names:
+                await self._client.create_collection(
+                    collection_name=self._collection,
+                    vectors_config=rest.VectorParams(
+                        size=self._vector_size,
+                        distance=rest.Distance.COSINE,
+                    ),
+                    on_disk_payload=True,
+                    quantization_config=self._quantization_config(),
+                )
+
+            await self._ensure_payload_indexes()
+            self._ensured = True
 
-        await self._ensure_payload_indexes()
+    def _quantization_config(self) -> Optional[Any]:
+        if not self._scalar_quantization:
+            return None
+        return rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
 
     async def _ensure_payload_indexes(self) -> None:
         """Create the payload indexes needed for multi-tenant filtering."""
@@ -86,6 +211,8 @@ class QdrantRepository:
         keyword_type = getattr(getattr(rest, "KeywordIndexType", None), "KEYWORD", "keyword")
         bool_type = getattr(getattr(rest, "BoolIndexType", None), "BOOL", "bool")
         datetime_type = getattr(getattr(rest, "DatetimeIndexType", None), "DATETIME", "datetime")
+        text_type = getattr(getattr(rest, "TextIndexType", None), "TEXT", "text")
+        word_tokenizer = getattr(getattr(rest, "TokenizerType", None), "WORD", "word")
 
         required_indexes = {
             "org_id": rest.KeywordIndexParams(type=keyword_type, is_tenant=True),
@@ -97,6 +224,11 @@ class QdrantRepository:
             "deleted": getattr(rest, "BoolIndexParams", lambda **_: None)(type=bool_type),
             "created_at": getattr(rest, "DatetimeIndexParams", lambda **_: None)(type=datetime_type),
             "updated_at": getattr(rest, "DatetimeIndexParams", lambda **_: None)(type=datetime_type),
+            "text": getattr(rest, "TextIndexParams", lambda **_: None)(
+                type=text_type,
+                tokenizer=word_tokenizer,
+                lowercase=True,
+            ),
         }
 
         for field_name, schema in required_indexes.items():
@@ -133,8 +265,7 @@ class QdrantRepository:
         tags: Optional[List[str]] = None,
     ) -> rest.Filter:
         conditions: List[rest.FieldCondition] = [
-            rest.FieldCondition(key="org_id", match=rest.MatchValue(value=org_id)),
-            rest.FieldCondition(key="agent_id", match=rest.MatchValue(value=agent_id)),
+            *_tenant_conditions(org_id, agent_id),
         ]
         if scope:
             conditions.append(rest.FieldCondition(key="scope", match=rest.MatchValue(value=scope)))
@@ -172,7 +303,7 @@ class QdrantRepository:
             return None
 
         query_filter = self._build_filter(org_id, agent_id, scope=scope, tags=tags)
-        now_iso = datetime.utcnow().isoformat()
+        now_iso = utcnow().isoformat()
         half_life_seconds = float(self._time_decay_half_life_days * 24 * 60 * 60)
         prefetch_limit = max(limit * 4, max(limit, 1))
         prefetch_limit = min(prefetch_limit, 128)
@@ -183,6 +314,7 @@ class QdrantRepository:
                 prefetch=rest.Prefetch(
                     query=rest.NearestQuery(nearest=vector),
                     filter=query_filter,
+                    params=self._search_params,
                     limit=prefetch_limit,
                 ),
                 query=rest.FormulaQuery(
@@ -209,18 +341,29 @@ class QdrantRepository:
             return None
 
         self._reranker_available = True
-        hits: List[MemoryHit] = []
-        for point in response.points:
-            payload = MemoryPayload.model_validate(point.payload)
-            hits.append(
-                MemoryHit(
-                    id=str(point.id),
-                    score=point.score,
-                    text=payload.text,
-                    payload=payload,
-                )
+        return await self._to_hits(response.points)
+
+    @staticmethod
+    async def _validate_payloads(points: Sequence[Any]) -> List[MemoryPayload]:
+        return [_payload_from_dict(point.payload or {}) for point in points]
+
+    # Points are typed by qdrant-client and payloads are parsed above, so the wrappers
+    # are assembled without another validation pass.
+    async def _to_hits(self, points: Sequence[Any]) -> List[MemoryHit]:
+        payloads = await self._validate_payloads(points)
+        return [
+            MemoryHit.model_construct(
+                id=str(point.id), score=point.score, text=payload.text, payload=payload
             )
-        return hits
+            for point, payload in zip(points, payloads, strict=True)
+        ]
+
+    async def _to_records(self, points: Sequence[Any]) -> List[MemoryRecord]:
+        payloads = await self._validate_payloads(points)
+        return [
+            MemoryRecord.model_construct(id=str(point.id), text=payload.text, payload=payload)
+            for point, payload in zip(points, payloads, strict=True)
+        ]
 
     @staticmethod
     def _has_tenant_flag(schema: object) -> bool:
@@ -238,25 +381,100 @@ class QdrantRepository:
 
         return False
 
+    @staticmethod
+    def _build_points(records: Sequence[MemoryRecord]) -> List[rest.PointStruct]:
+        # Payloads are flat models of scalars and a tag list, so a shallow copy of the
+        # field dict matches model_dump() without the serializer pass. MemoryPayload
+        # always carries text and updated_at, so nothing needs filling in.
+        return [
+            rest.PointStruct(
+                id=record.id, vector=record.vector, payload=dict(record.payload.__dict__)
+            )
+            for record in records
+        ]
+
     async def upsert(self, records: Iterable[MemoryRecord]) -> List[str]:
-        points: List[rest.PointStruct] = []
-        now = datetime.utcnow().isoformat()
-        for record in records:
-            payload = record.payload.dict()
-            payload.setdefault("updated_at", now)
-            payload.setdefault("text", record.text)
-            points.append(
-                rest.PointStruct(
-                    id=record.id,
-                    vector=record.vector,
-                    payload=payload,
+        batch = list(records)
+        if not batch:
+            return []
+        # Dumping payloads and wrapping vectors is pure CPU; keep large batches off the loop.
+        if len(batch) > PAYLOAD_THREAD_THRESHOLD:
+            points = await asyncio.to_thread(self._build_points, batch)
+        else:
+            points = self._build_points(batch)
+        if len(points) > UPSERT_BATCH_SIZE * 2:
+            semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+
+            async def _upsert_chunk(chunk: List[rest.PointStruct]) -> None:
+                async with semaphore:
+                    await self._client.upsert(collection_name=self._collection, points=chunk)
+
+            await asyncio.gather(
+                *(
+                    _upsert_chunk(points[i : i + UPSERT_BATCH_SIZE])
+                    for i in range(0, len(points), UPSERT_BATCH_SIZE)
                 )
             )
-        if not points:
-            return []
-        await self._client.upsert(collection_name=self._collection, points=points)
+        else:
+            await self._client.upsert(collection_name=self._collection, points=points)
+        if self._hash_blooms:
+            self._remember_hashes(points)
         return [point.id for point in points]
 
+    def _remember_hashes(self, points: Sequence[Any]) -> None:
+        for point in points:
+            payload = point.payload or {}
+            bloom = self._hash_blooms.get((payload.get("org_id"), payload.get("agent_id")))
+            dedupe_hash = payload.get("dedupe_hash")
+            if bloom is not None and dedupe_hash:
+                bloom.add(dedupe_hash)
+
+    async def _tenant_bloom(self, org_id: str, agent_id: str) -> BloomFilter:
+        """Return the tenant's dedupe Bloom filter, warming it from Qdrant on first use."""
+
+        key = (org_id, agent_id)
+        bloom = self._hash_blooms.get(key)
+        if bloom is not None:
+            return bloom
+        lock = self._bloom_locks.setdefault(key, asyncio.Lock())
+        try:
+            return await self._warm_tenant_bloom(key, lock)
+        finally:
+            if key not in self._hash_blooms:
+                # Failed warm-up: do not keep a lock for a tenant with no filter.
+                self._bloom_locks.pop(key, None)
+
+    async def _warm_tenant_bloom(self, key: Tuple[str, str], lock: asyncio.Lock) -> BloomFilter:
+        org_id, agent_id = key
+        async with lock:
+            bloom = self._hash_blooms.get(key)
+            if bloom is not None:
+                return bloom
+            bloom = BloomFilter()
+            query_filter = rest.Filter(
+                must=[
+                    *_tenant_conditions(org_id, agent_id),
+                ]
+            )
+            offset = None
+            while True:
+                points, offset = await self._client.scroll(
+                    collection_name=self._collection,
+                    scroll_filter=query_filter,
+                    limit=BLOOM_WARM_PAGE_SIZE,
+                    offset=offset,
+                    with_payload=["dedupe_hash"],
+                    with_vectors=False,
+                )
+                for point in points:
+                    dedupe_hash = (point.payload or {}).get("dedupe_hash")
+                    if dedupe_hash:
+                        bloom.add(dedupe_hash)
+                if offset is None:
+                    break
+            self._hash_blooms[key] = bloom
+            return bloom
+
     async def search(
         self,
         vector: List[float],
@@ -268,27 +486,48 @@ class QdrantRepository:
         tags: Optional[List[str]] = None,
     ) -> List[MemoryHit]:
         query_filter = self._build_filter(org_id, agent_id, scope=scope, tags=tags)
-        search_result = await self._client.search(
+        # AsyncQdrantClient.search is gone in 1.19; query_points is its replacement.
+        response = await self._client.query_points(
             collection_name=self._collection,
-            query_vector=vector,
+            query=vector,
             query_filter=query_filter,
+            search_params=self._search_params,
             with_payload=True,
             with_vectors=False,
             limit=limit,
-            score_threshold=None,
         )
-        hits: List[MemoryHit] = []
-        for point in search_result:
-            payload = MemoryPayload.model_validate(point.payload)
-            hits.append(
-                MemoryHit(
-                    id=str(point.id),
-                    score=point.score,
-                    text=payload.text,
-                    payload=payload,
-                )
+        return await self._to_hits(response.points)
+
+    async def search_batch(
+        self,
+        vectors: Sequence[List[float]],
+        *,
+        limits: Sequence[int],
+        org_id: str,
+        agent_id: str,
+        scopes: Sequence[Optional[str]],
+        tags: Sequence[Optional[List[str]]],
+    ) -> List[List[MemoryHit]]:
+        """Run several nearest-neighbour queries for one tenant in a single request."""
+
+        if not vectors:
+            return []
+        requests = [
+            rest.QueryRequest(
+                query=vector,
+                filter=self._build_filter(org_id, agent_id, scope=scope, tags=query_tags),
+                params=self._search_params,
+                limit=limit,
+                with_payload=True,
+                with_vector=False,
             )
-        return hits
+            for vector, limit, scope, query_tags in zip(vectors, limits, scopes, tags, strict=True)
+        ]
+        responses = await self._client.query_batch_points(
+            collection_name=self._collection,
+            requests=requests,
+        )
+        return [await self._to_hits(response.points) for response in responses]
 
     async def get(self, memory_id: str) -> Optional[MemoryRecord]:
         response = await self._client.retrieve(
@@ -300,9 +539,23 @@ class QdrantRepository:
         if not response:
             return None
         point = response[0]
-        payload = MemoryPayload.model_validate(point.payload)
+        payload = _payload_from_dict(point.payload)
         text = point.payload.get("text", "")
-        return MemoryRecord(id=str(point.id), text=text, payload=payload)
+        return MemoryRecord.model_construct(id=str(point.id), text=text, payload=payload)
+
+    async def get_owner(self, memory_id: str) -> Optional[Tuple[str, str]]:
+        """Return the (org_id, agent_id) that owns a memory, fetching only those fields."""
+
+        response = await self._client.retrieve(
+            collection_name=self._collection,
+            ids=[memory_id],
+            with_vectors=False,
+            with_payload=["org_id", "agent_id"],
+        )
+        if not response:
+            return None
+        payload = response[0].payload or {}
+        return payload.get("org_id"), payload.get("agent_id")
 
     async def delete(self, memory_id: str) -> bool:
         operation = await self._client.delete(
@@ -311,18 +564,24 @@ class QdrantRepository:
         )
         return operation.status == rest.UpdateStatus.COMPLETED
 
-    async def delete_many(self, memory_ids: List[str]) -> bool:
+    async def delete_many(self, memory_ids: List[str], org_id: str, agent_id: str) -> bool:
+        """Delete the given ids in one request, restricted to the tenant's points."""
+
         if not memory_ids:
             return True
         operation = await self._client.delete(
             collection_name=self._collection,
-            points_selector=rest.PointIdsList(points=memory_ids),
+            points_selector=rest.Filter(
+                must=[
+                    rest.HasIdCondition(has_id=memory_ids),
+                    *_tenant_conditions(org_id, agent_id),
+                ]
+            ),
         )
         return operation.status == rest.UpdateStatus.COMPLETED
 
     async def set_payload(self, record: MemoryRecord) -> None:
-        payload = record.payload.dict()
-        payload.setdefault("text", record.text)
+        payload = dict(record.payload.__dict__)
         await self._client.set_payload(
             collection_name=self._collection,
             payload=payload,
@@ -330,19 +589,35 @@ class QdrantRepository:
         )
 
     async def soft_delete(self, memory_id: str) -> bool:
-        record = await self.get(memory_id)
-        if not record:
-            return False
-        record.payload.deleted = True
-        record.payload.updated_at = datetime.utcnow()
-        await self.set_payload(record)
+        # Partial payload update: only the tombstone fields are sent, no read-back needed.
+        await self._client.set_payload(
+            collection_name=self._collection,
+            payload={"deleted": True, "updated_at": utcnow().isoformat()},
+            points=[memory_id],
+        )
         return True
 
+    async def soft_delete_many(self, memory_ids: List[str], org_id: str, agent_id: str) -> None:
+        """Tombstone the given ids in one request, restricted to the tenant's points."""
+
+        if not memory_ids:
+            return
+        now_iso = utcnow().isoformat()
+        await self._client.set_payload(
+            collection_name=self._collection,
+            payload={"deleted": True, "updated_at": now_iso},
+            points=rest.Filter(
+                must=[
+                    rest.HasIdCondition(has_id=memory_ids),
+                    *_tenant_conditions(org_id, agent_id),
+                ]
+            ),
+        )
+
     async def find_by_hash(self, dedupe_hash: str, org_id: str, agent_id: str) -> Optional[MemoryRecord]:
         query_filter = rest.Filter(
             must=[
-                rest.FieldCondition(key="org_id", match=rest.MatchValue(value=org_id)),
-                rest.FieldCondition(key="agent_id", match=rest.MatchValue(value=agent_id)),
+                *_tenant_conditions(org_id, agent_id),
                 rest.FieldCondition(key="dedupe_hash", match=rest.MatchValue(value=dedupe_hash)),
             ]
         )
@@ -356,9 +631,41 @@ class QdrantRepository:
         if not points:
             return None
         point = points[0]
-        payload = MemoryPayload.model_validate(point.payload)
+        payload = _payload_from_dict(point.payload)
         text = payload.text
-        return MemoryRecord(id=str(point.id), text=text, payload=payload)
+        return MemoryRecord.model_construct(id=str(point.id), text=text, payload=payload)
+
+    async def find_by_hashes(
+        self, dedupe_hashes: Sequence[str], org_id: str, agent_id: str
+    ) -> Dict[str, MemoryRecord]:
+        """Return existing tenant records keyed by dedupe hash in a single scroll."""
+
+        unique_hashes = list(dict.fromkeys(dedupe_hashes))
+        if unique_hashes and self._dedupe_bloom:
+            # Bloom misses are definitely new, so only probable hits go to Qdrant.
+            bloom = await self._tenant_bloom(org_id, agent_id)
+            unique_hashes = [dedupe_hash for dedupe_hash in unique_hashes if dedupe_hash in bloom]
+        if not unique_hashes:
+            return {}
+        query_filter = rest.Filter(
+            must=[
+                *_tenant_conditions(org_id, agent_id),
+                rest.FieldCondition(key="dedupe_hash", match=rest.MatchAny(any=unique_hashes)),
+            ]
+        )
+        points, _ = await self._client.scroll(
+            collection_name=self._collection,
+            scroll_filter=query_filter,
+            limit=len(unique_hashes),
+            with_payload=True,
+            with_vectors=False,
+        )
+        existing: Dict[str, MemoryRecord] = {}
+        for record in await self._to_records(points):
+            dedupe_hash = record.payload.dedupe_hash
+            if dedupe_hash and dedupe_hash not in existing:
+                existing[dedupe_hash] = record
+        return existing
 
     async def get_many(self, memory_ids: List[str]) -> List[MemoryRecord]:
         if not memory_ids:
@@ -369,12 +676,7 @@ class QdrantRepository:
             with_vectors=False,
             with_payload=True,
         )
-        records: List[MemoryRecord] = []
-        for point in response:
-            payload = MemoryPayload.model_validate(point.payload)
-            text = payload.text
-            records.append(MemoryRecord(id=str(point.id), text=text, payload=payload))
-        return records
+        return await self._to_records(response)
 
     async def list_recent(
         self,
@@ -385,11 +687,10 @@ class QdrantRepository:
         include_deleted: bool = False,
     ) -> List[MemoryRecord]:
         conditions: List[rest.FieldCondition] = [
-            rest.FieldCondition(key="org_id", match=rest.MatchValue(value=org_id)),
-            rest.FieldCondition(key="agent_id", match=rest.MatchValue(value=agent_id)),
+            *_tenant_conditions(org_id, agent_id),
         ]
         if not include_deleted:
-            conditions.append(rest.FieldCondition(key="deleted", match=rest.MatchValue(value=False)))
+            conditions.append(_NOT_DELETED)
 
         order_by = None
         if hasattr(rest, "OrderBy") and hasattr(rest, "OrderByKind"):
@@ -404,12 +705,7 @@ class QdrantRepository:
             order_by=order_by,
         )
 
-        records: List[MemoryRecord] = []
-        for point in points:
-            payload = MemoryPayload.model_validate(point.payload)
-            text = payload.text
-            records.append(MemoryRecord(id=str(point.id), text=text, payload=payload))
-        return records
+        return await self._to_records(points)
 
     async def search_text(
         self,
@@ -420,34 +716,20 @@ class QdrantRepository:
         limit: int,
         include_deleted: bool = False,
     ) -> List[MemoryRecord]:
-        needle = query.lower()
         conditions: List[rest.FieldCondition] = [
-            rest.FieldCondition(key="org_id", match=rest.MatchValue(value=org_id)),
-            rest.FieldCondition(key="agent_id", match=rest.MatchValue(value=agent_id)),
+            *_tenant_conditions(org_id, agent_id),
+            rest.FieldCondition(key="text", match=rest.MatchText(text=query)),
         ]
         if not include_deleted:
-            conditions.append(rest.FieldCondition(key="deleted", match=rest.MatchValue(value=False)))
+            conditions.append(_NOT_DELETED)
 
-        records: List[MemoryRecord] = []
-        offset = None
-        while len(records) < limit:
-            points, offset = await self._client.scroll(
-                collection_name=self._collection,
-                scroll_filter=rest.Filter(must=conditions),
-                offset=offset,
-                limit=100,
-                with_vectors=False,
-                with_payload=True,
-            )
-            if not points:
-                break
-            for point in points:
-                payload = MemoryPayload.model_validate(point.payload)
-                text = payload.text or ""
-                if needle in text.lower():
-                    records.append(MemoryRecord(id=str(point.id), text=text, payload=payload))
-                    if len(records) >= limit:
-                        break
-            if offset is None:
-                break
-        return records
+        # Matching runs against the full-text index on `text`; one page is enough.
+        points, _ = await self._client.scroll(
+            collection_name=self._collection,
+            scroll_filter=rest.Filter(must=conditions),
+            limit=limit,
+            with_vectors=False,
+            with_payload=True,
+        )
+
+        return await self._to_records(points)
@@ -4,33 +4,59 @@ from __future__ import annotations
 
 import hashlib
 import uuid
-from datetime import datetime
-from math import sin
+from datetime import UTC, datetime
+from functools import lru_cache
+from math import cos, exp, log, sin
+from typing import Iterable, List
 
 TIME_DECAY_HALF_LIFE_DAYS = 90
+_LN_HALF = log(0.5)
+
+
+def utcnow() -> datetime:
+    """Naive UTC now, matching the timestamps already stored, without ``datetime.utcnow``."""
+
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 def make_id(org_id: str, agent_id: str, text: str) -> str:
     """Deterministic UUID5 based on tenant and memory text."""
 
-    namespace = uuid.uuid5(uuid.NAMESPACE_URL, f"memory::{org_id}::{agent_id}")
-    return str(uuid.uuid5(namespace, text))
+    return str(uuid.uuid5(_tenant_namespace(org_id, agent_id), text))
+
+
+@lru_cache(maxsize=1024)
+def _tenant_namespace(org_id: str, agent_id: str) -> uuid.UUID:
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"memory::{org_id}::{agent_id}")
+
+
+@lru_cache(maxsize=1024)
+def _tenant_digest(org_id: str, agent_id: str, user_id: str) -> "hashlib._Hash":
+    """SHA-256 state primed with the ``org|agent|user|`` prefix; callers must copy it."""
+
+    return hashlib.sha256(f"{org_id}|{agent_id}|{user_id}|".encode())
 
 
 def compute_hash(org_id: str, agent_id: str, user_id: str, text: str) -> str:
     """Stable SHA-256 digest used for deduplication."""
 
-    digest = hashlib.sha256()
-    digest.update(org_id.encode("utf-8"))
-    digest.update(b"|")
-    digest.update(agent_id.encode("utf-8"))
-    digest.update(b"|")
-    digest.update(user_id.encode("utf-8"))
-    digest.update(b"|")
-    digest.update(text.encode("utf-8"))
+    digest = _tenant_digest(org_id, agent_id, user_id).copy()
+    digest.update(text.encode())
     return digest.hexdigest()
 
 
+def compute_hashes(org_id: str, agent_id: str, user_id: str, texts: Iterable[str]) -> List[str]:
+    """Batch form of :func:`compute_hash` that hashes the shared tenant prefix once."""
+
+    prefix = _tenant_digest(org_id, agent_id, user_id)
+    hashes: List[str] = []
+    for text in texts:
+        digest = prefix.copy()
+        digest.update(text.encode())
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
 def apply_time_decay(
     score: float,
     created_at: datetime,
@@ -40,8 +66,29 @@ def apply_time_decay(
     """Apply exponential time decay to relevance scores."""
 
     days = max((now - created_at).days, 0)
-    decay_factor = 0.5 ** (days / half_life_days)
-    return score * decay_factor
+    return score * _decay_factor(days, half_life_days)
+
+
+@lru_cache(maxsize=4096)
+def _decay_factor(days: int, half_life_days: int) -> float:
+    """0.5 ** (days / half_life_days); ages are whole days, so the table stays small."""
+
+    return exp(days * _LN_HALF / half_life_days)
+
+
+def apply_time_decay_batch(
+    scores: Iterable[float],
+    created_ats: Iterable[datetime],
+    now: datetime,
+    half_life_days: int = TIME_DECAY_HALF_LIFE_DAYS,
+) -> List[float]:
+    """Decay many scores at once against the shared per-day factor table."""
+
+    factor = _decay_factor
+    return [
+        score * factor(max((now - created_at).days, 0), half_life_days)
+        for score, created_at in zip(scores, created_ats, strict=True)
+    ]
 
 
 def make_embedding_stub(text: str, size: int = 768) -> list[float]:
@@ -50,4 +97,14 @@ def make_embedding_stub(text: str, size: int = 768) -> list[float]:
     if not text:
         return [0.0] * size
     base = float(abs(hash(text)) % 10_000) / 10_000.0
-    return [sin(base + i * 0.01) for i in range(size)]
+    # sin(base + x) = sin(base)cos(x) + cos(base)sin(x): two sin/cos calls per text
+    # instead of one per dimension, against tables shared by every stub.
+    sin_base, cos_base = sin(base), cos(base)
+    sines, cosines = _stub_tables(size)
+    return [sin_base * c + cos_base * s for s, c in zip(sines, cosines, strict=True)]
+
+
+@lru_cache(maxsize=8)
+def _stub_tables(size: int) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    offsets = [i * 0.01 for i in range(size)]
+    return tuple(sin(x) for x in offsets), tuple(cos(x) for x in offsets)
@@ -6,16 +6,29 @@ from typing import AsyncGenerator, List, Optional
 
 import orjson
 from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 from pydantic import BaseModel, Field
 
 from core import MemoryCore, load_settings
-from core.exceptions import AuthenticationError, AuthorizationError, MemoryServiceError, NotFoundError
-from core.models import MemoryAddRequest, SearchRequest, UpdateMemoryRequest
+from core.exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    MemoryServiceError,
+    NotFoundError,
+)
+from core.models import (
+    MemoryAddRequest,
+    MemoryHit,
+    MemoryRecord,
+    SearchRequest,
+    UpdateMemoryRequest,
+)
 from core.security import SecurityService
 
-app = FastAPI(title="Memory Service Gateway", version="0.1.0")
+app = FastAPI(
+    title="Memory Service Gateway", version="0.1.0", default_response_class=ORJSONResponse
+)
 
 
 @app.on_event("startup")
@@ -66,9 +79,28 @@ async def tenancy_context(
     return resolved_org, resolved_agent
 
 
+# Payloads are flat models of JSON-native values and datetimes, which orjson encodes
+# exactly like model_dump(mode="json"); their field dicts are handed over as-is.
+def _record_to_dict(record: MemoryRecord) -> dict:
+    return {
+        "id": record.id,
+        "text": record.text,
+        "payload": record.payload.__dict__,
+    }
+
+
+def _hit_to_dict(hit: MemoryHit) -> dict:
+    return {
+        "id": hit.id,
+        "score": hit.score,
+        "text": hit.text,
+        "payload": hit.payload.__dict__,
+    }
+
+
 @app.exception_handler(MemoryServiceError)
-async def memory_error_handler(_: Request, exc: MemoryServiceError) -> JSONResponse:
-    return JSONResponse(status_code=400, content={"detail": str(exc)})
+async def memory_error_handler(_: Request, exc: MemoryServiceError) -> ORJSONResponse:
+    return ORJSONResponse(status_code=400, content={"detail": str(exc)})
 
 
 @app.post("/api/v1/mem/add")
@@ -76,20 +108,11 @@ async def add_memories(
     request: MemoryAddRequest,
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     items = await core.add(org_id, agent_id, request)
-    response = {
-        "items": [
-            {
-                "id": item.id,
-                "text": item.text,
-                "payload": item.payload.model_dump(mode="json"),
-            }
-            for item in items
-        ]
-    }
-    return JSONResponse(status_code=status.HTTP_201_CREATED, content=response)
+    response = {"items": [_record_to_dict(item) for item in items]}
+    return ORJSONResponse(status_code=status.HTTP_201_CREATED, content=response)
 
 
 @app.get("/api/v1/mem/search")
@@ -102,22 +125,17 @@ async def search_memories(
     tags: List[str] = Query(default_factory=list),
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     search_request = SearchRequest(query=q, user_id=user_id, k=k, scope=scope, tags=tags)
     hits = await core.search(org_id, agent_id, search_request)
-    response = {
-        "hits": [
-            {
-                "id": hit.id,
-                "score": hit.score,
-                "text": hit.text,
-                "payload": hit.payload.model_dump(mode="json"),
-            }
-            for hit in hits
-        ]
-    }
-    return JSONResponse(content=response)
+    response = {"hits": [_hit_to_dict(hit) for hit in hits]}
+    return ORJSONResponse(content=response)
+
+
+# Terminal events, pre-encoded; the NDJSON form has always carried a null payload.
+_NDJSON_DONE = orjson.dumps({"type": "done", "payload": None}) + b"\n"
+_SSE_DONE = orjson.dumps({"type": "done"}).decode("utf-8")
 
 
 async def _search_generator(
@@ -125,17 +143,12 @@ async def _search_generator(
     org_id: str,
     agent_id: str,
     search_request: SearchRequest,
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[bytes, None]:
+    """Yield each hit event encoded once; the NDJSON and SSE wrappers reuse the bytes."""
+
     hits = await core.search(org_id, agent_id, search_request)
     for hit in hits:
-        yield {
-            "type": "hit",
-            "id": hit.id,
-            "score": hit.score,
-            "text": hit.text,
-            "payload": hit.payload.model_dump(mode="json"),
-        }
-    yield {"type": "done"}
+        yield orjson.dumps({"type": "hit", **_hit_to_dict(hit)})
 
 
 @app.get("/api/v1/mem/search/ndjson")
@@ -153,11 +166,8 @@ async def search_memories_ndjson(
 
     async def ndjson_stream() -> AsyncGenerator[bytes, None]:
         async for event in _search_generator(core, org_id, agent_id, search_request):
-            serialised = {
-                **event,
-                "payload": event.get("payload"),
-            }
-            yield orjson.dumps(serialised) + b"\n"
+            yield event + b"\n"
+        yield _NDJSON_DONE
 
     return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
 
@@ -177,7 +187,8 @@ async def search_memories_stream(
 
     async def event_stream() -> AsyncGenerator[dict, None]:
         async for event in _search_generator(core, org_id, agent_id, search_request):
-            yield {"event": event["type"], "data": orjson.dumps(event).decode("utf-8")}
+            yield {"event": "hit", "data": event.decode("utf-8")}
+        yield {"event": "done", "data": _SSE_DONE}
 
     return EventSourceResponse(event_stream(), ping=20.0)
 
@@ -188,19 +199,13 @@ async def update_memory(
     request: UpdateMemoryRequest,
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     try:
         record = await core.update(org_id, agent_id, memory_id, request)
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return JSONResponse(
-        content={
-            "id": record.id,
-            "text": record.text,
-            "payload": record.payload.model_dump(mode="json"),
-        }
-    )
+    return ORJSONResponse(content=_record_to_dict(record))
 
 
 @app.delete("/api/v1/mem/{memory_id}")
@@ -209,42 +214,34 @@ async def delete_memory(
     hard: bool = Query(default=False),
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     try:
         await core.delete(org_id, agent_id, memory_id, hard=hard)
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return JSONResponse(content={"ok": True})
+    return ORJSONResponse(content={"ok": True})
 
 
 class IdsPayload(BaseModel):
-    ids: List[str] = Field(default_factory=list, min_items=1)
+    ids: List[str] = Field(default_factory=list, min_length=1)
 
 
 class BatchDeletePayload(BaseModel):
-    ids: List[str] = Field(default_factory=list, min_items=1)
+    ids: List[str] = Field(default_factory=list, min_length=1)
     hard: bool = False
 
 
-def _record_to_dict(record) -> dict:
-    return {
-        "id": record.id,
-        "text": record.text,
-        "payload": record.payload.model_dump(mode="json"),
-    }
-
-
 @app.get("/api/v1/mem/list")
 async def list_memories(
     limit: int = Query(default=20, ge=1, le=200),
     include_deleted: bool = Query(default=False),
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     records = await core.list(org_id, agent_id, limit=limit, include_deleted=include_deleted)
-    return JSONResponse(content={"items": [_record_to_dict(record) for record in records]})
+    return ORJSONResponse(content={"items": [_record_to_dict(record) for record in records]})
 
 
 @app.post("/api/v1/mem/open")
@@ -252,10 +249,10 @@ async def open_memories(
     payload: IdsPayload,
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     records = await core.get_many(org_id, agent_id, payload.ids)
-    return JSONResponse(content={"items": [_record_to_dict(record) for record in records]})
+    return ORJSONResponse(content={"items": [_record_to_dict(record) for record in records]})
 
 
 @app.post("/api/v1/mem/delete/batch")
@@ -263,10 +260,10 @@ async def delete_memories_batch(
     payload: BatchDeletePayload,
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     await core.delete_many(org_id, agent_id, payload.ids, hard=payload.hard)
-    return JSONResponse(content={"ok": True, "ids": payload.ids, "hard": payload.hard})
+    return ORJSONResponse(content={"ok": True, "ids": payload.ids, "hard": payload.hard})
 
 
 @app.get("/api/v1/mem/search/text")
@@ -276,7 +273,7 @@ async def search_memories_text(
     include_deleted: bool = Query(default=False),
     tenant: tuple[str, str] = Depends(tenancy_context),
     core: MemoryCore = Depends(get_app_core),
-) -> JSONResponse:
+) -> ORJSONResponse:
     org_id, agent_id = tenant
     records = await core.search_text(org_id, agent_id, q, limit=limit, include_deleted=include_deleted)
-    return JSONResponse(content={"items": [_record_to_dict(record) for record in records]})
+    return ORJSONResponse(content={"items": [_record_to_dict(record) for record in records]})
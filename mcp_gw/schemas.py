@@ -43,10 +43,11 @@ class MemoryItemView(BaseModel):
     def from_record(
         cls, record: "MemoryRecord | MemoryRecordProtocol"
     ) -> "MemoryItemView":
-        return cls(
+        # Records come from MemoryCore and were validated on the way in; skip re-validation.
+        return cls.model_construct(
             id=record.id,
             text=record.text,
-            payload=MemoryPayloadView.model_validate(record.payload),
+            payload=MemoryPayloadView.model_construct(**record.payload.__dict__),
         )
 
 
@@ -59,10 +60,10 @@ class MemoryHitView(MemoryItemView):
     def from_hit(
         cls, hit: "MemoryHit | MemoryHitProtocol"
     ) -> "MemoryHitView":
-        return cls(
+        return cls.model_construct(
             id=hit.id,
             text=hit.text,
-            payload=MemoryPayloadView.model_validate(hit.payload),
+            payload=MemoryPayloadView.model_construct(**hit.payload.__dict__),
             score=hit.score,
         )
 
@@ -4,14 +4,14 @@ from __future__ import annotations
 
 import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Sequence
 
+import mcp.types as mcp_types
 from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.fastmcp.exceptions import ToolError
 from mcp.server.fastmcp.tools.base import ToolAnnotations
 
-import mcp.types as mcp_types
-
 from pydantic import BaseModel, Field
 
 from core import MemoryCore, load_settings
@@ -26,6 +26,7 @@ from .schemas import (
     MemoryHitProtocol,
     MemoryHitView,
     MemoryItemView,
+    MemoryPayloadView,
     MemoryRecordProtocol,
     ListMemoriesResponse,
     SearchMemoryResponse,
@@ -42,20 +43,37 @@ def _get_core() -> MemoryCore:
     return _core
 
 
+def _item_views(records: Sequence[MemoryRecordProtocol]) -> List[MemoryItemView]:
+    # Same as MemoryItemView.from_record, with the constructors bound once per batch.
+    item = MemoryItemView.model_construct
+    payload = MemoryPayloadView.model_construct
+    return [
+        item(id=record.id, text=record.text, payload=payload(**record.payload.__dict__))
+        for record in records
+    ]
+
+
 def _to_add_response(records: Sequence[MemoryRecordProtocol]) -> AddMemoriesResponse:
-    return AddMemoriesResponse(items=[MemoryItemView.from_record(record) for record in records])
+    return AddMemoriesResponse.model_construct(items=_item_views(records))
 
 
 def _to_search_response(hits: Sequence[MemoryHitProtocol]) -> SearchMemoryResponse:
-    return SearchMemoryResponse(hits=[MemoryHitView.from_hit(hit) for hit in hits])
+    view = MemoryHitView.model_construct
+    payload = MemoryPayloadView.model_construct
+    return SearchMemoryResponse.model_construct(
+        hits=[
+            view(id=hit.id, text=hit.text, payload=payload(**hit.payload.__dict__), score=hit.score)
+            for hit in hits
+        ]
+    )
 
 
 def _to_update_response(record: MemoryRecordProtocol) -> UpdateMemoryResponse:
-    return UpdateMemoryResponse(record=MemoryItemView.from_record(record))
+    return UpdateMemoryResponse.model_construct(record=_item_views([record])[0])
 
 
 def _to_list_response(records: Sequence[MemoryRecordProtocol]) -> ListMemoriesResponse:
-    return ListMemoriesResponse(items=[MemoryItemView.from_record(record) for record in records])
+    return ListMemoriesResponse.model_construct(items=_item_views(records))
 
 
 @asynccontextmanager
@@ -87,7 +105,17 @@ app = FastMCP(
 )
 
 
+# Every tool shares one of three hint combinations.
+_READ_ONLY_TOOL = ToolAnnotations(readOnlyHint=True, destructiveHint=False, idempotentHint=True)
+_WRITE_TOOL = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=False)
+_DESTRUCTIVE_TOOL = ToolAnnotations(readOnlyHint=False, destructiveHint=True, idempotentHint=False)
+
+
 SESSION_KEY = "memscend_identity_cache"
+ELICITATION_KEY = "memscend_supports_elicitation"
+_ELICITATION_CAPABILITY = mcp_types.ClientCapabilities(
+    elicitation=mcp_types.ElicitationCapability()
+)
 
 
 class TenantIdentity(BaseModel):
@@ -109,11 +137,13 @@ class UserIdentity(BaseModel):
 
 def _identity_cache(ctx: Context) -> Dict[str, str]:
     session = ctx.request_context.session
-    cache = getattr(session, SESSION_KEY, None)
-    if cache is None or not isinstance(cache, dict):
-        cache = {}
+    # Only this module sets the attribute, and after the first call it is always there.
+    try:
+        return getattr(session, SESSION_KEY)
+    except AttributeError:
+        cache: Dict[str, str] = {}
         setattr(session, SESSION_KEY, cache)
-    return cache
+        return cache
 
 
 def _client_supports_elicitation(ctx: Context) -> bool:
@@ -121,11 +151,15 @@ def _client_supports_elicitation(ctx: Context) -> bool:
         session = ctx.request_context.session
     except ValueError:
         return False
-    capability = mcp_types.ClientCapabilities(elicitation=mcp_types.ElicitationCapability())
-    try:
-        return session.check_client_capability(capability)
-    except AttributeError:
-        return False
+    # Client capabilities are fixed at initialization, so check once per session.
+    supported = getattr(session, ELICITATION_KEY, None)
+    if supported is None:
+        try:
+            supported = bool(session.check_client_capability(_ELICITATION_CAPABILITY))
+        except AttributeError:
+            return False
+        setattr(session, ELICITATION_KEY, supported)
+    return supported
 
 
 async def _resolve_tenant(
@@ -135,6 +169,13 @@ async def _resolve_tenant(
 ) -> tuple[str, str]:
     cache = _identity_cache(ctx)
 
+    # Fully specified calls are the common case; remember the identifiers for later
+    # calls on this session and skip the fallback bookkeeping below.
+    if org_id and agent_id:
+        cache["org_id"] = org_id
+        cache["agent_id"] = agent_id
+        return org_id, agent_id
+
     if org_id:
         cache["org_id"] = org_id
     else:
@@ -210,11 +251,7 @@ async def _resolve_user(ctx: Context, user_id: Optional[str]) -> str:
     title="Add Memories",
     description="Persist user memories for downstream retrieval and reasoning.",
     structured_output=True,
-    annotations=ToolAnnotations(
-        readOnlyHint=False,
-        destructiveHint=False,
-        idempotentHint=False,
-    ),
+    annotations=_WRITE_TOOL,
 )
 async def add_memories(
     text: Optional[str],
@@ -231,8 +268,9 @@ async def add_memories(
 ) -> AddMemoriesResponse:
     org_id, agent_id = await _resolve_tenant(ctx, org_id, agent_id)
     user_id = await _resolve_user(ctx, user_id)
-    ctx.debug("add_memories invoked", org_id=org_id, agent_id=agent_id, user_id=user_id)
-    request = MemoryAddRequest(
+    # FastMCP has already validated the arguments against the tool signature, and
+    # MemoryAddRequest/SearchRequest add no constraints beyond those types.
+    request = MemoryAddRequest.model_construct(
         text=text,
         messages=messages,
         user_id=user_id,
@@ -242,12 +280,12 @@ async def add_memories(
         source=source,
         idempotency_key=idempotency_key,
     )
-    ctx.report_progress(0, 3, "queued")
+    await ctx.report_progress(0, 3, "queued")
     items = await _get_core().add(org_id, agent_id, request)
-    ctx.report_progress(2, 3, message=f"persisted {len(items)} records")
+    await ctx.report_progress(2, 3, f"persisted {len(items)} records")
     if not items:
-        ctx.warning("No memories persisted after filtering/dedupe", org_id=org_id, agent_id=agent_id)
-    ctx.report_progress(3, 3, "done")
+        await ctx.warning("No memories persisted after filtering/dedupe")
+    await ctx.report_progress(3, 3, "done")
     return _to_add_response(items)
 
 
@@ -255,11 +293,7 @@ async def add_memories(
     title="Search Memory",
     description="Retrieve the most relevant memories for the supplied query.",
     structured_output=True,
-    annotations=ToolAnnotations(
-        readOnlyHint=True,
-        destructiveHint=False,
-        idempotentHint=True,
-    ),
+    annotations=_READ_ONLY_TOOL,
 )
 async def search_memory(
     query: str,
@@ -272,19 +306,18 @@ async def search_memory(
     tags: Optional[List[str]] = None,
 ) -> SearchMemoryResponse:
     org_id, agent_id = await _resolve_tenant(ctx, org_id, agent_id)
-    ctx.debug("search_memory invoked", org_id=org_id, agent_id=agent_id, query=query)
-    search_request = SearchRequest(
+    search_request = SearchRequest.model_construct(
         query=query,
         user_id=user_id,
         k=k,
         scope=scope,
         tags=tags or [],
     )
-    ctx.report_progress(0.0, 1.0, "embedding query")
+    await ctx.report_progress(0.0, 1.0, "embedding query")
     hits = await _get_core().search(org_id, agent_id, search_request)
-    ctx.report_progress(1.0, 1.0, message=f"retrieved {len(hits)} hits")
+    await ctx.report_progress(1.0, 1.0, f"retrieved {len(hits)} hits")
     if not hits:
-        ctx.info("No results for query", org_id=org_id, agent_id=agent_id)
+        await ctx.info("No results for query")
     return _to_search_response(hits)
 
 
@@ -292,11 +325,7 @@ async def search_memory(
     title="Update Memory",
     description="Patch text, scope, tags, TTL, or soft-delete flag for a memory.",
     structured_output=True,
-    annotations=ToolAnnotations(
-        readOnlyHint=False,
-        destructiveHint=False,
-        idempotentHint=False,
-    ),
+    annotations=_WRITE_TOOL,
 )
 async def update_memory(
     memory_id: str,
@@ -310,7 +339,6 @@ async def update_memory(
     deleted: Optional[bool] = None,
 ) -> UpdateMemoryResponse:
     org_id, agent_id = await _resolve_tenant(ctx, org_id, agent_id)
-    ctx.debug("update_memory invoked", memory_id=memory_id, org_id=org_id, agent_id=agent_id)
     update_request = UpdateMemoryRequest(
         text=text,
         tags=tags,
@@ -321,7 +349,7 @@ async def update_memory(
     try:
         record = await _get_core().update(org_id, agent_id, memory_id, update_request)
     except NotFoundError as exc:  # pragma: no cover - defensive (integration tested)
-        ctx.error("Memory not found during update", memory_id=memory_id, org_id=org_id, agent_id=agent_id)
+        await ctx.error("Memory not found during update")
         raise ToolError("memory not found for supplied identifiers") from exc
     return _to_update_response(record)
 
@@ -330,11 +358,7 @@ async def update_memory(
     title="Delete Memory",
     description="Soft delete a memory, or hard delete when requested.",
     structured_output=True,
-    annotations=ToolAnnotations(
-        readOnlyHint=False,
-        destructiveHint=True,
-        idempotentHint=False,
-    ),
+    annotations=_DESTRUCTIVE_TOOL,
 )
 async def delete_memory(
     memory_id: str,
@@ -344,17 +368,10 @@ async def delete_memory(
     hard: bool = False,
 ) -> DeleteMemoryResponse:
     org_id, agent_id = await _resolve_tenant(ctx, org_id, agent_id)
-    ctx.debug("delete_memory invoked", memory_id=memory_id, org_id=org_id, agent_id=agent_id, hard=hard)
     try:
         await _get_core().delete(org_id, agent_id, memory_id, hard=hard)
     except NotFoundError as exc:
-        ctx.warning(
-            "Memory not found during delete",
-            memory_id=memory_id,
-            org_id=org_id,
-            agent_id=agent_id,
-            hard=hard,
-        )
+        await ctx.warning("Memory not found during delete")
         raise ToolError("memory not found for supplied identifiers") from exc
     return DeleteMemoryResponse(ok=True)
 
@@ -363,7 +380,7 @@ async def delete_memory(
     title="List Memories",
     description="Return latest memories for this tenant (ordered by update time).",
     structured_output=True,
-    annotations=ToolAnnotations(readOnlyHint=True, idempotentHint=True, destructiveHint=False),
+    annotations=_READ_ONLY_TOOL,
 )
 async def list_memories(
     ctx: Context,
@@ -381,7 +398,7 @@ async def list_memories(
     title="Open Memories",
     description="Fetch memories by their identifiers.",
     structured_output=True,
-    annotations=ToolAnnotations(readOnlyHint=True, idempotentHint=True, destructiveHint=False),
+    annotations=_READ_ONLY_TOOL,
 )
 async def open_memories(
     ctx: Context,
@@ -400,7 +417,7 @@ async def open_memories(
     title="Delete Memories",
     description="Delete multiple memories at once (soft by default).",
     structured_output=True,
-    annotations=ToolAnnotations(readOnlyHint=False, idempotentHint=False, destructiveHint=True),
+    annotations=_DESTRUCTIVE_TOOL,
 )
 async def delete_memories(
     ctx: Context,
@@ -418,9 +435,9 @@ async def delete_memories(
 
 @app.tool(
     title="Search Memory Text",
-    description="Run a substring search against stored memories (non-semantic).",
+    description="Run a full-text keyword search against stored memories (non-semantic).",
     structured_output=True,
-    annotations=ToolAnnotations(readOnlyHint=True, idempotentHint=True, destructiveHint=False),
+    annotations=_READ_ONLY_TOOL,
 )
 async def search_memory_text(
     ctx: Context,
@@ -448,12 +465,18 @@ async def search_memory_text(
     mime_type="application/json",
 )
 async def capabilities() -> CapabilitiesResource:
+    return _capabilities_resource()
+
+
+@lru_cache(maxsize=1)
+def _capabilities_resource() -> CapabilitiesResource:
+    # Everything here derives from the settings loaded at import; build it once.
     core_cfg = _settings.core
     return CapabilitiesResource(
         name="memscend-memory",
         version="2025-09-19",
         transports=["sse", "streamable-http", "stdio"],
-        enabled_scopes=core_cfg.write.enabled_scopes,
+        enabled_scopes=list(core_cfg.write.enabled_scopes),
         default_top_k=core_cfg.retrieval.top_k,
         vector_size=core_cfg.collection.vector_size,
         normalize_with_llm=core_cfg.write.normalize_with_llm,
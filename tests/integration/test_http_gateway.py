@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -85,3 +86,17 @@ def test_add_search_update_delete_flow(client):
     assert response.status_code == 200
     dummy_core.delete.assert_awaited()
 
+
+
+def test_search_ndjson_streams_hits_then_done(client):
+    test_client, _ = client
+    headers = {"X-Org-Id": "org-1", "X-Agent-Id": "agent-1"}
+
+    response = test_client.get(
+        "/api/v1/mem/search/ndjson", params={"q": "notifications"}, headers=headers
+    )
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["type"] == "hit"
+    assert events[0]["payload"]["tags"] == ["quiet"]
+    assert events[-1] == {"type": "done", "payload": None}
@@ -0,0 +1,22 @@
+"""Unit tests for the dedupe Bloom filter."""
+
+from __future__ import annotations
+
+from core.storage.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    items = [f"hash-{i}" for i in range(1_000)]
+    bloom.update(items)
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1_000
+
+
+def test_bloom_filter_false_positive_rate_is_bounded() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    bloom.update(f"hash-{i}" for i in range(1_000))
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
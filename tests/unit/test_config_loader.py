@@ -0,0 +1,58 @@
+"""Unit tests for configuration loading."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.config.loader import load_settings
+from core.config.models import AgentOverrides, CoreConfig, OrgConfig
+
+
+def _write_config(path: Path, environment: str) -> None:
+    path.write_text(
+        f"environment: {environment}\nservices:\n  openrouter_api_key: key\n",
+        encoding="utf-8",
+    )
+
+
+def test_load_settings_returns_fresh_settings_per_call(tmp_path: Path) -> None:
+    config_file = tmp_path / "memory-config.yaml"
+    _write_config(config_file, "staging")
+
+    first = load_settings(config_file)
+    first.core.write.min_chars = 99
+    assert load_settings(config_file).core.write.min_chars != 99
+
+    _write_config(config_file, "production")
+    assert load_settings(config_file).environment == "production"
+
+
+def test_organisation_overrides_are_parsed_into_typed_models() -> None:
+    core = CoreConfig(
+        organisations={
+            "acme": {
+                "model": "org/model",
+                "agents": {"assistant": {"model": "agent/model"}},
+            }
+        }
+    )
+
+    org_config = core.organisations["acme"]
+    assert isinstance(org_config, OrgConfig)
+    assert isinstance(org_config.agents["assistant"], AgentOverrides)
+    assert org_config.agents["assistant"].model == "agent/model"
+
+
+def test_invalid_tenant_blocks_fail_at_load_time(tmp_path: Path) -> None:
+    config_file = tmp_path / "memory-config.yaml"
+    config_file.write_text(
+        "services:\n  openrouter_api_key: key\n"
+        "core:\n  organisations:\n    acme:\n      agents:\n"
+        "        assistant:\n          retrieval:\n            top_k: 0\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(RuntimeError, match="assistant"):
+        load_settings(config_file)
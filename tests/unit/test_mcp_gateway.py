@@ -54,6 +54,7 @@ async def test_capabilities_resource_reflects_settings() -> None:
 
     assert resource.vector_size == server._settings.core.collection.vector_size
     assert "sse" in resource.transports
+    assert await server.capabilities() is resource  # type: ignore[attr-defined]
 
 
 def test_to_list_response() -> None:
@@ -66,8 +67,10 @@ def test_to_list_response() -> None:
 class _DummySession:
     def __init__(self, supports_elicitation: bool) -> None:
         self.supports_elicitation = supports_elicitation
+        self.capability_checks = 0
 
     def check_client_capability(self, capability) -> bool:  # pragma: no cover - trivial
+        self.capability_checks += 1
         return self.supports_elicitation
 
 
@@ -101,9 +104,15 @@ class _DummyContext:
 
 @pytest.mark.asyncio
 async def test_resolve_tenant_requires_elicitation_support() -> None:
-    ctx = _DummyContext(_DummySession(False), [])
+    session = _DummySession(False)
+    ctx = _DummyContext(session, [])
     with pytest.raises(ToolError):
         await server._resolve_tenant(ctx, None, None)  # type: ignore[attr-defined]
+    with pytest.raises(ToolError):
+        await server._resolve_user(ctx, None)  # type: ignore[attr-defined]
+
+    # The capability answer is remembered on the session.
+    assert session.capability_checks == 1
 
 
 @pytest.mark.asyncio
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import List
 from unittest.mock import AsyncMock
 
 import pytest
 
 from core.config.models import CoreConfig, ExternalServiceConfig, SecurityConfig, Settings
+from core.exceptions import NotFoundError
 from core.models import MemoryAddRequest, MemoryHit, MemoryPayload, MemoryRecord, SearchRequest
 from core.services import MemoryCore
 
 
+def _echo_texts(texts, model=None, **_):
+    return texts
+
+
 class StubRepository:
     def __init__(self) -> None:
         self.by_hash: dict[str, MemoryRecord] = {}
@@ -20,13 +27,21 @@ class StubRepository:
         self.list_recent_results: List[MemoryRecord] = []
         self.search_text_results: List[MemoryRecord] = []
         self.deleted_ids: List[str] = []
+        self.search_batch_calls: List[List[List[float]]] = []
 
     async def ensure_collection(self) -> None:  # pragma: no cover - not used in unit
         return None
 
-    async def find_by_hash(self, dedupe_hash: str, org_id: str, agent_id: str) -> MemoryRecord | None:
+    async def find_by_hash(
+        self, dedupe_hash: str, org_id: str, agent_id: str
+    ) -> MemoryRecord | None:
         return self.by_hash.get(dedupe_hash)
 
+    async def find_by_hashes(
+        self, dedupe_hashes: List[str], org_id: str, agent_id: str
+    ) -> dict[str, MemoryRecord]:
+        return {h: self.by_hash[h] for h in dedupe_hashes if h in self.by_hash}
+
     async def upsert(self, records: List[MemoryRecord]) -> List[str]:
         self.upsert_calls.append(records)
         for record in records:
@@ -35,24 +50,58 @@ class StubRepository:
             self.records[record.id] = record
         return [record.id for record in records]
 
-    async def search(self, vector: List[float], *, limit: int, org_id: str, agent_id: str, scope=None, tags=None):
+    async def search(
+        self, vector: List[float], *, limit: int, org_id: str, agent_id: str, scope=None, tags=None
+    ):
         return self.search_results[:limit]
 
-    async def list_recent(self, org_id: str, agent_id: str, *, limit: int, include_deleted: bool = False):
+    async def search_with_reranker(
+        self, vector: List[float], *, limit: int, org_id: str, agent_id: str, scope=None, tags=None
+    ):
+        # Exercise the client-side time-decay fallback path.
+        return None
+
+    async def search_batch(self, vectors, *, limits, org_id: str, agent_id: str, scopes, tags):
+        self.search_batch_calls.append(list(vectors))
+        return [self.search_results[:limit] for limit in limits]
+
+    async def list_recent(
+        self, org_id: str, agent_id: str, *, limit: int, include_deleted: bool = False
+    ):
         return self.list_recent_results[:limit]
 
     async def get_many(self, memory_ids: List[str]):
         return [self.records[mid] for mid in memory_ids if mid in self.records]
 
-    async def delete_many(self, memory_ids: List[str]):
-        self.deleted_ids.extend(memory_ids)
-
-    async def search_text(self, org_id: str, agent_id: str, query: str, *, limit: int, include_deleted: bool = False):
+    async def delete_many(self, memory_ids: List[str], org_id: str, agent_id: str):
+        # Mirrors the repository filter: only the tenant's own points are removed.
+        for mid in memory_ids:
+            record = self.records.get(mid)
+            if record and record.payload.org_id == org_id and record.payload.agent_id == agent_id:
+                del self.records[mid]
+                self.deleted_ids.append(mid)
+
+    async def search_text(
+        self, org_id: str, agent_id: str, query: str, *, limit: int, include_deleted: bool = False
+    ):
         return self.search_text_results[:limit]
 
     async def set_payload(self, record: MemoryRecord):
         self.records[record.id] = record
 
+    async def get_owner(self, memory_id: str):
+        record = self.records.get(memory_id)
+        return (record.payload.org_id, record.payload.agent_id) if record else None
+
+    async def delete(self, memory_id: str):
+        self.deleted_ids.append(memory_id)
+
+    async def soft_delete_many(self, memory_ids: List[str], org_id: str, agent_id: str):
+        for mid in memory_ids:
+            record = self.records.get(mid)
+            if record and record.payload.org_id == org_id and record.payload.agent_id == agent_id:
+                record.payload.deleted = True
+
 
 def _make_payload(**overrides: object) -> MemoryPayload:
     base = {
@@ -69,6 +118,18 @@ def _make_payload(**overrides: object) -> MemoryPayload:
     return MemoryPayload(**base)
 
 
+def _core_with(settings: Settings, repo: StubRepository) -> MemoryCore:
+    """Build a MemoryCore whose collections all resolve to ``repo``."""
+
+    core = MemoryCore(settings)
+
+    async def fake_get_repository(overrides):
+        return repo
+
+    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    return core
+
+
 @pytest.fixture
 def settings() -> Settings:
     return Settings(
@@ -86,20 +147,18 @@ def settings() -> Settings:
 
 @pytest.mark.asyncio
 async def test_add_deduplicates_memories(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
-
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    core = _core_with(settings, repo)
     core._tei.embed = AsyncMock(return_value=[[0.1] * 768])  # type: ignore[assignment]
-    core._llm.normalize_memories = AsyncMock(side_effect=lambda texts, model=None: texts)  # type: ignore[assignment]
+    core._llm.normalize_memories = AsyncMock(side_effect=_echo_texts)  # type: ignore[assignment]
 
     request = MemoryAddRequest(user_id="user-1", text="Call mom tomorrow", scope="prefs")
 
     first = await core.add("org-1", "agent-1", request)
     assert len(first) == 1
+    # Normalisation is scoped to the tenant so batching never mixes tenants.
+    assert core._llm.normalize_memories.await_args.kwargs["org_id"] == "org-1"
+    assert core._llm.normalize_memories.await_args.kwargs["agent_id"] == "agent-1"
     assert len(repo.upsert_calls) == 1
 
     second = await core.add("org-1", "agent-1", request)
@@ -110,13 +169,8 @@ async def test_add_deduplicates_memories(settings: Settings):
 
 @pytest.mark.asyncio
 async def test_search_applies_time_decay(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
-
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    core = _core_with(settings, repo)
     core._tei.embed = AsyncMock(return_value=[[0.2] * 768])  # type: ignore[assignment]
 
     recent_payload = MemoryPayload(
@@ -146,18 +200,15 @@ async def test_search_applies_time_decay(settings: Settings):
     ]
 
     results = await core.search("org-1", "agent-1", SearchRequest(query="prefs"))
-    assert [hit.id for hit in results] == ["recent", "old"], "recent record should outrank after decay"
+    assert [hit.id for hit in results] == ["recent", "old"], (
+        "recent record should outrank after decay"
+    )
 
 
 @pytest.mark.asyncio
 async def test_list_recent_memories(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
-
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    core = _core_with(settings, repo)
     payload = MemoryPayload(**_make_payload().model_dump())
     record = MemoryRecord(id="mem-1", text="cached", payload=payload)
     repo.list_recent_results = [record]
@@ -168,13 +219,8 @@ async def test_list_recent_memories(settings: Settings):
 
 @pytest.mark.asyncio
 async def test_get_many_filters_tenant(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
-
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    core = _core_with(settings, repo)
     payload = _make_payload()
     repo.records["mem-1"] = MemoryRecord(id="mem-1", text="hello", payload=payload)
     repo.records["foreign"] = MemoryRecord(
@@ -189,45 +235,176 @@ async def test_get_many_filters_tenant(settings: Settings):
 
 @pytest.mark.asyncio
 async def test_delete_many_soft(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
-
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    core = _core_with(settings, repo)
     payload = _make_payload()
     repo.records["mem-1"] = MemoryRecord(id="mem-1", text="hello", payload=payload)
+    repo.records["foreign"] = MemoryRecord(
+        id="foreign", text="other", payload=_make_payload(org_id="other")
+    )
+
+    repo.records["mem-2"] = MemoryRecord(id="mem-2", text="again", payload=_make_payload())
 
-    await core.delete_many("acme", "assistant", ["mem-1"], hard=False)
+    await core.delete_many("acme", "assistant", ["mem-1", "mem-2", "foreign"], hard=False)
+    assert repo.records["mem-2"].payload.deleted is True
     assert repo.records["mem-1"].payload.deleted is True
+    assert repo.records["foreign"].payload.deleted is False
 
 
 @pytest.mark.asyncio
 async def test_delete_many_hard(settings: Settings):
-    core = MemoryCore(settings)
     repo = StubRepository()
+    core = _core_with(settings, repo)
 
-    async def fake_get_repository(overrides):
-        return repo
-
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+    repo.records["mem-1"] = MemoryRecord(id="mem-1", text="hello", payload=_make_payload())
+    repo.records["foreign"] = MemoryRecord(
+        id="foreign", text="other", payload=_make_payload(org_id="other")
+    )
 
-    await core.delete_many("acme", "assistant", ["mem-1"], hard=True)
+    await core.delete_many("acme", "assistant", ["mem-1", "foreign"], hard=True)
     assert repo.deleted_ids == ["mem-1"]
+    assert "foreign" in repo.records
 
 
 @pytest.mark.asyncio
-async def test_search_text(settings: Settings):
-    core = MemoryCore(settings)
+async def test_delete_checks_owner_before_removing(settings: Settings):
     repo = StubRepository()
+    core = _core_with(settings, repo)
+    repo.records["mem-1"] = MemoryRecord(id="mem-1", text="hello", payload=_make_payload())
+    repo.records["foreign"] = MemoryRecord(
+        id="foreign", text="other", payload=_make_payload(org_id="other")
+    )
 
-    async def fake_get_repository(overrides):
-        return repo
+    await core.delete("acme", "assistant", "mem-1", hard=True)
+    with pytest.raises(NotFoundError):
+        await core.delete("acme", "assistant", "foreign", hard=True)
+    assert repo.deleted_ids == ["mem-1"]
 
-    core._get_repository = fake_get_repository  # type: ignore[attr-defined]
+
+@pytest.mark.asyncio
+async def test_search_text(settings: Settings):
+    repo = StubRepository()
+    core = _core_with(settings, repo)
     payload = _make_payload()
     repo.search_text_results = [MemoryRecord(id="mem-1", text="hello", payload=payload)]
 
     results = await core.search_text("acme", "assistant", "hello", limit=5)
     assert [item.id for item in results] == ["mem-1"]
+
+
+def test_iter_texts_strips_and_skips_duplicates_and_short_snippets():
+    request = MemoryAddRequest(
+        user_id="user-1",
+        text="  Prefers window seats on flights  ",
+        messages=[
+            {"role": "user", "content": "Prefers window seats on flights"},
+            {"role": "user", "content": "ok"},
+            {"role": "user", "content": "   "},
+            {"role": "user", "content": "Allergic to peanuts and shellfish"},
+        ],
+    )
+
+    assert list(request.iter_texts(min_chars=12)) == [
+        "Prefers window seats on flights",
+        "Allergic to peanuts and shellfish",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_text_adds_share_one_embed_call(settings: Settings):
+    repo = StubRepository()
+    core = _core_with(settings, repo)
+    core._tei.embed = AsyncMock(  # type: ignore[assignment]
+        side_effect=lambda texts: [[0.1] * 768 for _ in texts]
+    )
+    core._llm.normalize_memories = AsyncMock(side_effect=_echo_texts)  # type: ignore[assignment]
+
+    requests = [
+        MemoryAddRequest(user_id="user-1", text=text, scope="prefs")
+        for text in ("Prefers green tea", "Works from Lisbon", "Allergic to peanuts")
+    ]
+    results = await asyncio.gather(*(core.add("org-1", "agent-1", request) for request in requests))
+
+    assert [len(records) for records in results] == [1, 1, 1]
+    core._tei.embed.assert_awaited_once()
+    await core._tei.close()
+
+
+@pytest.mark.asyncio
+async def test_add_deduplicates_near_paraphrase(settings: Settings):
+    settings.core.write.near_duplicate_threshold = 0.95
+    repo = StubRepository()
+    core = _core_with(settings, repo)
+    core._tei.embed = AsyncMock(return_value=[[0.1] * 768])  # type: ignore[assignment]
+    core._llm.normalize_memories = AsyncMock(side_effect=_echo_texts)  # type: ignore[assignment]
+    payload = _make_payload(
+        org_id="org-1", agent_id="agent-1", text="Call mom tomorrow", scope="prefs"
+    )
+    repo.search_results = [
+        MemoryHit(id="mem-1", score=0.97, text="Call mom tomorrow", payload=payload)
+    ]
+
+    request = MemoryAddRequest(user_id="user-1", text="Call my mom tomorrow", scope="prefs")
+    records = await core.add("org-1", "agent-1", request)
+
+    assert [record.id for record in records] == ["mem-1"]
+    assert repo.upsert_calls == []
+
+    # Another user's neighbour is not a duplicate of this user's memory.
+    repo.search_results = [
+        MemoryHit(
+            id="mem-2",
+            score=0.99,
+            text="Call mom tomorrow",
+            payload=_make_payload(user_id="user-2"),
+        )
+    ]
+    records = await core.add("org-1", "agent-1", request)
+    assert records[0].id != "mem-2"
+    assert len(repo.upsert_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_repository_reuses_instance_per_collection(settings: Settings):
+    core = MemoryCore(settings)
+    client = SimpleNamespace(
+        get_collections=AsyncMock(
+            return_value=SimpleNamespace(collections=[SimpleNamespace(name="memories")])
+        ),
+        get_collection=AsyncMock(return_value=SimpleNamespace(payload_schema={})),
+        create_payload_index=AsyncMock(),
+    )
+    core._qdrant_client = client  # type: ignore[assignment]
+    overrides = core._resolve_overrides("acme", "assistant")
+
+    first = await core._get_repository(overrides)
+    second = await core._get_repository(core._resolve_overrides("acme", "other-agent"))
+
+    assert first is second
+    client.get_collections.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_add_overlaps_embedding_with_dedupe_lookup(settings: Settings):
+    repo = StubRepository()
+    core = _core_with(settings, repo)
+    core._llm.normalize_memories = AsyncMock(side_effect=_echo_texts)  # type: ignore[assignment]
+    lookup_started = asyncio.Event()
+
+    async def embed(texts):
+        # Deadlocks (and times out) unless the dedupe lookup runs concurrently.
+        await asyncio.wait_for(lookup_started.wait(), timeout=1.0)
+        return [[0.1] * 768 for _ in texts]
+
+    async def find_by_hashes(dedupe_hashes, org_id, agent_id):
+        lookup_started.set()
+        return {}
+
+    core._tei.embed = embed  # type: ignore[assignment]
+    repo.find_by_hashes = find_by_hashes  # type: ignore[assignment]
+
+    request = MemoryAddRequest(user_id="user-1", text="Prefers aisle seats", scope="prefs")
+    records = await core.add("org-1", "agent-1", request)
+
+    assert len(records) == 1
+    await core._tei.close()
@@ -0,0 +1,236 @@
+"""Unit tests for the OpenRouter normalisation client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.clients.openrouter import LLMCache, OpenRouterClient
+
+
+def _completion(content: str) -> dict:
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def _make_client(handler, **kwargs) -> OpenRouterClient:
+    client = OpenRouterClient(
+        api_key="key", base_url="https://example.com", model="test/model", **kwargs
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # type: ignore[attr-defined]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_normalize_memories_caches_repeated_payloads() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        content = json.dumps([{"memory": "Prefers green tea.", "skip": False}])
+        return httpx.Response(200, json=_completion(content))
+
+    client = _make_client(handler)
+
+    first = await client.normalize_memories(["I love green tea"])
+    second = await client.normalize_memories(["I love green tea"])
+
+    assert first == second == ["Prefers green tea."]
+    assert len(calls) == 1
+    assert client.cache.hits == 1
+    assert client.cache.misses == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_normalize_memories_does_not_cache_failures() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"error": "bad request"})
+
+    client = _make_client(handler)
+
+    assert await client.normalize_memories(["raw snippet"]) == ["raw snippet"]
+    assert await client.normalize_memories(["raw snippet"]) == ["raw snippet"]
+    assert client.cache.hits == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_ping_bypasses_cache_and_reports_failures() -> None:
+    status = 200
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = json.dumps([{"memory": "ping", "skip": False}])
+        return httpx.Response(status, json=_completion(content))
+
+    client = _make_client(handler)
+
+    assert await client.ping() is True
+    status = 401
+    assert await client.ping() is False
+    assert client.cache.hits == client.cache.misses == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced_into_one_request() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        content = json.dumps(
+            [
+                [{"memory": "Likes jazz.", "skip": False}],
+                [{"memory": "Lives in Lisbon.", "skip": False}],
+            ]
+        )
+        return httpx.Response(200, json=_completion(content))
+
+    client = _make_client(handler, batch_window_seconds=0.02)
+
+    first, second = await asyncio.gather(
+        client.normalize_memories(["I like jazz"], org_id="acme", agent_id="assistant"),
+        client.normalize_memories(["I live in Lisbon"], org_id="acme", agent_id="assistant"),
+    )
+
+    assert first == ["Likes jazz."]
+    assert second == ["Lives in Lisbon."]
+    assert len(calls) == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_line_fallback_only_strips_leading_bullets() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion("- Range is 10-20 -\n* Second item\n\n-"))
+
+    client = _make_client(handler)
+
+    assert await client.normalize_memories(["snippet"]) == ["Range is 10-20 -", "Second item"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_json_mode_objects_are_unwrapped() -> None:
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        content = json.dumps(
+            {"memories": [{"memory": "Works remotely on Fridays.", "skip": False}]}
+        )
+        return httpx.Response(200, json=_completion(content))
+
+    client = _make_client(handler)
+
+    normalized = await client.normalize_memories(["I work from home on Fridays"])
+    assert normalized == ["Works remotely on Fridays."]
+    assert bodies[0]["response_format"] == {"type": "json_object"}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_json_mode_object_without_memories_keeps_raw_snippets() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion(json.dumps({"result": "ok"})))
+
+    client = _make_client(handler)
+
+    assert await client.normalize_memories(["raw snippet"]) == ["raw snippet"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_response_format_rejection_retries_once_without_the_field() -> None:
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        if "response_format" in body:
+            return httpx.Response(422, json={"error": "response_format is not supported"})
+        return httpx.Response(200, json=_completion("- Works remotely on Fridays."))
+
+    client = _make_client(handler)
+
+    normalized = await client.normalize_memories(["I work from home on Fridays"])
+    assert normalized == ["Works remotely on Fridays."]
+    assert await client.normalize_memories(["I like tea"]) == ["Works remotely on Fridays."]
+    assert ["response_format" in body for body in bodies] == [True, False, False]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_other_failures_do_not_drop_json_mode() -> None:
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(401, json={"error": "invalid key"})
+
+    client = _make_client(handler)
+
+    assert await client.normalize_memories(["raw snippet"]) == ["raw snippet"]
+    assert await client.normalize_memories(["other snippet"]) == ["other snippet"]
+    assert all("response_format" in body for body in bodies)
+    assert len(bodies) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_batching_never_mixes_tenants_in_one_prompt() -> None:
+    prompts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        prompt = body["messages"][-1]["content"]
+        prompts.append(prompt)
+        memory = "Likes jazz." if "jazz" in prompt else "Lives in Lisbon."
+        content = json.dumps([{"memory": memory, "skip": False}])
+        return httpx.Response(200, json=_completion(content))
+
+    client = _make_client(handler, batch_window_seconds=0.02)
+
+    first, second = await asyncio.gather(
+        client.normalize_memories(["I like jazz"], org_id="acme", agent_id="assistant"),
+        client.normalize_memories(["I live in Lisbon"], org_id="globex", agent_id="assistant"),
+    )
+
+    assert first == ["Likes jazz."]
+    assert second == ["Lives in Lisbon."]
+    assert len(prompts) == 2
+    assert not any("jazz" in prompt and "Lisbon" in prompt for prompt in prompts)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_all_skipped_results_store_nothing_with_and_without_batching() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        skipped = [{"memory": "", "skip": True}]
+        if "### Block" in prompt:
+            content = json.dumps([skipped, [{"memory": "Lives in Lisbon.", "skip": False}]])
+        else:
+            content = json.dumps(skipped)
+        return httpx.Response(200, json=_completion(content))
+
+    single = _make_client(handler)
+    assert await single.normalize_memories(["just testing"]) == []
+    cache_key = LLMCache.make_key(single._build_body(["just testing"], "test/model"))
+    assert single.cache.get(cache_key) == []
+
+    batched = _make_client(handler, batch_window_seconds=0.02)
+    first, second = await asyncio.gather(
+        batched.normalize_memories(["just testing"], org_id="acme", agent_id="assistant"),
+        batched.normalize_memories(["I live in Lisbon"], org_id="acme", agent_id="assistant"),
+    )
+    assert first == []
+    assert second == ["Lives in Lisbon."]
+    assert batched.cache.get(cache_key) == []
+    await single.close()
+    await batched.close()
@@ -0,0 +1,146 @@
+"""Unit tests for the Qdrant repository with a mocked client."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.models import MemoryPayload, MemoryRecord
+from core.storage.qdrant_repository import UPSERT_BATCH_SIZE, QdrantRepository
+
+
+def _record(index: int) -> MemoryRecord:
+    payload = MemoryPayload(
+        org_id="acme",
+        agent_id="assistant",
+        user_id="user-1",
+        text=f"memo {index}",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    return MemoryRecord(id=f"mem-{index}", text=payload.text, payload=payload, vector=[0.1])
+
+
+@pytest.mark.asyncio
+async def test_upsert_splits_large_writes_into_batches() -> None:
+    client = SimpleNamespace(upsert=AsyncMock())
+    repo = QdrantRepository(client, "memories", 1)
+
+    ids = await repo.upsert([_record(i) for i in range(UPSERT_BATCH_SIZE * 3)])
+
+    assert len(ids) == UPSERT_BATCH_SIZE * 3
+    assert client.upsert.await_count == 3
+    calls = client.upsert.await_args_list
+    assert all(len(call.kwargs["points"]) == UPSERT_BATCH_SIZE for call in calls)
+
+
+@pytest.mark.asyncio
+async def test_upsert_sends_small_writes_in_one_request() -> None:
+    client = SimpleNamespace(upsert=AsyncMock())
+    repo = QdrantRepository(client, "memories", 1)
+
+    records = [_record(i) for i in range(3)]
+    await repo.upsert(records)
+
+    assert client.upsert.await_count == 1
+    points = client.upsert.await_args.kwargs["points"]
+    assert points[0].payload == records[0].payload.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_find_by_hashes_skips_scroll_for_unseen_hashes() -> None:
+    client = SimpleNamespace(
+        scroll=AsyncMock(return_value=([SimpleNamespace(payload={"dedupe_hash": "known"})], None))
+    )
+    repo = QdrantRepository(client, "memories", 4, dedupe_bloom=True)
+
+    assert await repo.find_by_hashes(["fresh-1", "fresh-2"], "org", "agent") == {}
+    # Only the warm-up scroll ran; the dedupe lookup itself was skipped.
+    assert client.scroll.await_count == 1
+    assert client.scroll.await_args.kwargs["with_payload"] == ["dedupe_hash"]
+
+
+@pytest.mark.asyncio
+async def test_tenant_blooms_are_bounded_and_evict_their_locks() -> None:
+    client = SimpleNamespace(scroll=AsyncMock(return_value=([], None)))
+    repo = QdrantRepository(client, "memories", 4, dedupe_bloom=True, bloom_cache_size=2)
+
+    for agent_id in ("a1", "a2", "a3"):
+        await repo.find_by_hashes(["fresh"], "org", agent_id)
+
+    assert set(repo._hash_blooms) == {("org", "a2"), ("org", "a3")}  # type: ignore[attr-defined]
+    assert set(repo._bloom_locks) == {("org", "a2"), ("org", "a3")}  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_read_path_parses_stored_timestamps_without_validation() -> None:
+    stored = _record(1).payload.model_dump(mode="json")
+    stored["legacy_field"] = "ignored"
+    client = SimpleNamespace(
+        retrieve=AsyncMock(return_value=[SimpleNamespace(id="mem-1", payload=stored)])
+    )
+    repo = QdrantRepository(client, "memories", 1)
+
+    [record] = await repo.get_many(["mem-1"])
+
+    assert isinstance(record.payload.created_at, datetime)
+    assert record.payload.tags == []
+    assert "legacy_field" not in record.payload.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_ensure_collection_indexes_dedupe_and_tenant_fields() -> None:
+    client = SimpleNamespace(
+        get_collections=AsyncMock(return_value=SimpleNamespace(collections=[])),
+        create_collection=AsyncMock(),
+        get_collection=AsyncMock(return_value=SimpleNamespace(payload_schema={})),
+        create_payload_index=AsyncMock(),
+    )
+    repo = QdrantRepository(client, "memories", 4)
+
+    await repo.ensure_collection()
+    await repo.ensure_collection()
+
+    indexed = [call.kwargs["field_name"] for call in client.create_payload_index.await_args_list]
+    assert {"dedupe_hash", "org_id", "agent_id"} <= set(indexed)
+    assert len(indexed) == len(set(indexed))
+    client.create_collection.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_many_scopes_ids_to_tenant() -> None:
+    client = SimpleNamespace(delete=AsyncMock(return_value=SimpleNamespace(status="completed")))
+    repo = QdrantRepository(client, "memories", 4)
+
+    await repo.delete_many(["mem-1", "mem-2"], "acme", "assistant")
+
+    client.delete.assert_awaited_once()
+    selector = client.delete.await_args.kwargs["points_selector"]
+    assert selector.must[0].has_id == ["mem-1", "mem-2"]
+    assert {condition.key for condition in selector.must[1:]} >= {"org_id", "agent_id"}
+
+
+@pytest.mark.asyncio
+async def test_ensure_collection_enables_quantization() -> None:
+    client = SimpleNamespace(
+        get_collections=AsyncMock(return_value=SimpleNamespace(collections=[])),
+        create_collection=AsyncMock(),
+        get_collection=AsyncMock(return_value=SimpleNamespace(payload_schema={})),
+        create_payload_index=AsyncMock(),
+        query_points=AsyncMock(return_value=SimpleNamespace(points=[])),
+    )
+    repo = QdrantRepository(client, "memories", 4, quantization_oversampling=3.0)
+
+    await repo.ensure_collection()
+    await repo.search([0.1] * 4, limit=2, org_id="acme", agent_id="assistant")
+
+    quantization = client.create_collection.await_args.kwargs["quantization_config"]
+    assert quantization.scalar.always_ram is True
+    search_kwargs = client.query_points.await_args.kwargs
+    assert search_kwargs["query"] == [0.1] * 4
+    search_params = search_kwargs["search_params"]
+    assert search_params.quantization.rescore is True
+    assert search_params.quantization.oversampling == 3.0
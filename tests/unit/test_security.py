@@ -1,8 +1,13 @@
+import json
+
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jwt.algorithms import ECAlgorithm, RSAAlgorithm
 
 from core.config.models import SecurityConfig
-from core.security import SecurityService
 from core.exceptions import AuthenticationError, AuthorizationError
+from core.security import SecurityService
 
 
 @pytest.mark.asyncio
@@ -14,6 +19,15 @@ async def test_authenticate_with_shared_secret():
     assert org_id == "org-123"
 
 
+@pytest.mark.asyncio
+async def test_authenticate_rejects_unknown_shared_secret():
+    config = SecurityConfig(shared_secrets={"org-123": "secret-token"})
+    service = SecurityService(config)
+
+    with pytest.raises(AuthenticationError):
+        await service.authenticate("Bearer secret-tokem")
+
+
 @pytest.mark.asyncio
 async def test_authenticate_rejects_missing_token():
     config = SecurityConfig(shared_secrets={"org-123": "secret-token"})
@@ -35,3 +49,54 @@ async def test_validate_tenancy_checks_headers():
     assert org_id == "org-123"
     assert agent_id == "agent-9"
 
+
+
+@pytest.mark.asyncio
+async def test_rejected_jwt_is_short_circuited():
+    config = SecurityConfig(jwk_url="https://issuer.example/jwks")
+    service = SecurityService(config)
+    calls = 0
+
+    async def fake_fetch_jwks():
+        nonlocal calls
+        calls += 1
+        return {}
+
+    service._fetch_jwks = fake_fetch_jwks  # type: ignore[method-assign]
+
+    for _ in range(2):
+        with pytest.raises(AuthenticationError):
+            await service.authenticate("Bearer not-a-jwt")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_mixed_jwks_keeps_usable_rsa_keys():
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    rsa_jwk = json.loads(RSAAlgorithm.to_jwk(rsa_key.public_key()))
+    ec_jwk = json.loads(ECAlgorithm.to_jwk(ec.generate_private_key(ec.SECP256R1()).public_key()))
+    keys = [
+        {**ec_jwk, "kid": "ec-1", "alg": "ES256"},
+        {**rsa_jwk, "kid": "no-alg"},
+        {**rsa_jwk},
+        {"kty": "RSA", "kid": "broken", "alg": "RS256"},
+    ]
+
+    prepared = SecurityService._prepare_jwks(keys)
+
+    assert set(prepared) == {"no-alg"}
+    assert prepared["no-alg"][1] == "RS256"
+
+    service = SecurityService(SecurityConfig(jwk_url="https://issuer.example/jwks"))
+
+    async def fake_fetch_jwks():
+        return prepared
+
+    service._fetch_jwks = fake_fetch_jwks  # type: ignore[method-assign]
+    token = jwt.encode(
+        {"org_id": "org-123", "aud": "memory-service", "iss": "memory-service"},
+        rsa_key,
+        algorithm="RS256",
+        headers={"kid": "no-alg"},
+    )
+    assert await service.authenticate(f"Bearer {token}") == "org-123"
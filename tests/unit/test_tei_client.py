@@ -0,0 +1,141 @@
+"""Unit tests for the TEI embedding client."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from array import array
+
+import httpx
+import orjson
+import pytest
+
+from core.clients.tei import TEIClient
+from core.exceptions import EmbeddingDimensionError
+
+
+def _make_client(handler) -> TEIClient:
+    client = TEIClient("https://tei")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # type: ignore[attr-defined]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_embed_decodes_base64_and_scatters_duplicates() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        requests.append(body)
+        data = [
+            {"embedding": base64.b64encode(array("f", [float(i), 0.5]).tobytes()).decode("ascii")}
+            for i, _ in enumerate(body["input"])
+        ]
+        return httpx.Response(200, json={"data": data})
+
+    client = _make_client(handler)
+
+    vectors = await client.embed(["alpha", "beta", "alpha"])
+
+    assert requests[0]["input"] == ["alpha", "beta"]
+    assert requests[0]["encoding_format"] == "base64"
+    assert vectors == [[0.0, 0.5], [1.0, 0.5], [0.0, 0.5]]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_accepts_float_lists() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": [{"embedding": [0.25, 0.75]}]})
+
+    client = _make_client(handler)
+
+    assert await client.embed(["alpha"]) == [[0.25, 0.75]]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_coalesced_shares_one_request() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        requests.append(body)
+        return httpx.Response(
+            200, json={"data": [{"embedding": [float(len(text))]} for text in body["input"]]}
+        )
+
+    client = _make_client(handler)
+
+    vectors = await asyncio.gather(
+        client.embed_coalesced("a"),
+        client.embed_coalesced("bb"),
+        client.embed_coalesced("ccc"),
+    )
+
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert len(requests) == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_coalesced_dispatches_lone_waiter_without_waiting() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        return httpx.Response(200, json={"data": [{"embedding": [0.5]} for _ in body["input"]]})
+
+    client = TEIClient("https://tei", coalesce_window_seconds=5.0)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # type: ignore[attr-defined]
+
+    assert await asyncio.wait_for(client.embed_coalesced("alone"), timeout=1.0) == [0.5]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_coalesced_serves_repeated_queries_from_cache() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        requests.append(body)
+        return httpx.Response(200, json={"data": [{"embedding": [0.5]} for _ in body["input"]]})
+
+    client = _make_client(handler)
+
+    assert await client.embed_coalesced("popular") == [0.5]
+    assert await client.embed_coalesced("popular") == [0.5]
+    assert len(requests) == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_embed_only_requests_uncached_texts() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        requests.append(body)
+        data = [{"embedding": [float(len(text))]} for text in body["input"]]
+        return httpx.Response(200, json={"data": data})
+
+    client = _make_client(handler)
+
+    assert await client.embed(["a", "bb"]) == [[1.0], [2.0]]
+    assert await client.embed(["bb", "ccc", "a"]) == [[2.0], [3.0], [1.0]]
+    assert await client.embed(["a"]) == [[1.0]]
+    assert [body["input"] for body in requests] == [["a", "bb"], ["ccc"]]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_wrong_length_embeddings_are_refused_not_stubbed() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": [{"embedding": [0.5, -1.0]}]})
+
+    client = TEIClient("https://tei", dimensions=3)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))  # type: ignore[attr-defined]
+
+    with pytest.raises(EmbeddingDimensionError):
+        await client.embed(["hello"])
+    assert client._cache is not None and "hello" not in client._cache  # type: ignore[attr-defined]
+    await client.close()
@@ -0,0 +1,48 @@
+"""Unit tests for hashing and decay helpers."""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.utils import (
+    TIME_DECAY_HALF_LIFE_DAYS,
+    apply_time_decay,
+    apply_time_decay_batch,
+    compute_hash,
+    compute_hashes,
+    make_id,
+)
+
+
+def test_compute_hash_is_stable_across_calls() -> None:
+    expected = hashlib.sha256(b"acme|assistant|user-1|hello").hexdigest()
+
+    assert compute_hash("acme", "assistant", "user-1", "hello") == expected
+    # The cached tenant prefix must not absorb earlier texts.
+    assert compute_hash("acme", "assistant", "user-1", "hello") == expected
+
+
+def test_compute_hashes_matches_single_hash() -> None:
+    texts = ["short", "caf\u00e9 au lait", "x" * 500]
+
+    assert compute_hashes("acme", "assistant", "user-1", texts) == [
+        compute_hash("acme", "assistant", "user-1", text) for text in texts
+    ]
+
+
+def test_apply_time_decay_halves_score_per_half_life() -> None:
+    now = datetime(2025, 1, 1)
+    created = now - timedelta(days=TIME_DECAY_HALF_LIFE_DAYS)
+
+    assert apply_time_decay(1.0, created, now) == pytest.approx(0.5)
+    assert apply_time_decay_batch([1.0, 2.0], [now, created], now) == pytest.approx([1.0, 1.0])
+
+
+def test_make_id_is_a_two_level_uuid5() -> None:
+    namespace = uuid.uuid5(uuid.NAMESPACE_URL, "memory::acme::assistant")
+
+    assert make_id("acme", "assistant", "hello") == str(uuid.uuid5(namespace, "hello"))